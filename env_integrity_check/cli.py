@@ -2,20 +2,26 @@
 CLI interface for env-integrity-check tool.
 """
 
-import json
+import io
+import itertools
+import re
 import sys
+from collections import defaultdict
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 
 import click
 
 from .metrics import Metrics
-from .policy_loader import PolicyLoader
+from .policy_loader import PolicyLoader, compile_pattern_rules
 from .sanitizer import Sanitizer
 from .sarif_reporter import SARIFReporter
 from .schema_introspect import SchemaIntrospector
 from .secrets_scanner import SecretsScanner
 
+# KEY=VALUE line; blank lines, comments and lines without '=' never match
+_ENV_LINE_RE = re.compile(r"[^\S\n]*(?![#\s])([^=\n]*?)[^\S\n]*=[^\S\n]*(.*?)[^\S\n]*$")
+
 
 @click.command()
 @click.argument("env_file", type=click.Path(exists=True, path_type=Path))
@@ -69,67 +75,73 @@ def main(
         # Initialize components
         metrics_collector = Metrics()
         sanitizer = Sanitizer() if sanitize else None
-        results = []
-
-        # Load .env file
-        env_content = env_file.read_text()
-        metrics_collector.record_file_size(len(env_content))
+        schema_results: List[Dict[str, Any]] = []
+        secrets_results: List[Dict[str, Any]] = []
+        policy_results: List[Dict[str, Any]] = []
 
-        # Parse .env file
-        env_vars = parse_env_file(env_content)
-        metrics_collector.record_env_var_count(len(env_vars))
+        # Parse .env file line by line
+        file_size = env_file.stat().st_size
+        with env_file.open("r") as fh:
+            env_vars = parse_env_file(fh)
 
         # Load policy if provided
         policy_rules = None
         if policy:
             policy_loader = PolicyLoader(policy)
             policy_rules = policy_loader.load()
-            metrics_collector.record_policy_loaded()
 
         # Schema validation
         if schema:
             introspector = SchemaIntrospector(schema)
             schema_results = introspector.validate_env_vars(env_vars)
-            results.extend(schema_results)
-            metrics_collector.record_schema_violations(len(schema_results))
 
         # Secrets detection
         if detect_secrets:
             secrets_scanner = SecretsScanner()
-            secrets_results = secrets_scanner.scan_env_file(env_file, env_vars)
-            results.extend(secrets_results)
-            metrics_collector.record_secrets_found(len(secrets_results))
+            secrets_results = list(secrets_scanner.scan_env_vars_batched(env_file, env_vars))
 
         # Policy validation
         if policy_rules:
             policy_results = validate_policy(env_vars, policy_rules)
-            results.extend(policy_results)
-            metrics_collector.record_policy_violations(len(policy_results))
 
-        # Sanitize results if enabled
+        metrics_collector.update(
+            file_size_bytes=file_size,
+            env_var_count=len(env_vars),
+            schema_violations=len(schema_results),
+            secrets_found=len(secrets_results),
+            policy_violations=len(policy_results),
+            policy_loaded=policy_rules is not None,
+        )
+
+        # Order results deterministically
+        results_iter = _order_results(schema_results, secrets_results, policy_results)
+
+        # Sanitize results if enabled, one at a time as they are streamed
         if sanitizer:
-            results = [sanitizer.sanitize_result(r) for r in results]
+            results_iter = _sanitize_each(results_iter, sanitizer)
 
         # Generate SARIF report
         reporter = SARIFReporter(
             tool_name="env-integrity-check",
             tool_version="0.1.0",
         )
-        sarif_output = reporter.generate_report(
-            results=results,
-            source_file=str(env_file),
-            metrics_data=metrics_collector.to_dict() if metrics else None,
-        )
+        metrics_data = metrics_collector.to_dict() if metrics else None
+
+        # Serialize the whole report before writing any of it, so an error
+        # while results are produced never leaves half a SARIF document behind
+        report = io.StringIO()
+        count = reporter.stream_report(results_iter, str(env_file), report, metrics_data)
 
         # Output report
         if output:
-            output.write_text(json.dumps(sarif_output, indent=2))
+            output.write_bytes(report.getvalue().encode("utf-8"))
             click.echo(f"Report written to {output}", err=True)
         else:
-            click.echo(json.dumps(sarif_output, indent=2))
+            report.write("\n")
+            _write_stdout(report.getvalue())
 
         # Exit with error code if violations found
-        if results:
+        if count:
             sys.exit(1)
 
     except Exception as e:
@@ -137,23 +149,63 @@ def main(
         sys.exit(2)
 
 
-def parse_env_file(content: str) -> dict:
-    """Parse .env file content into a dictionary."""
+def _write_stdout(text: str) -> None:
+    """Write text to stdout as UTF-8, whatever the terminal's encoding."""
+    stream = getattr(sys.stdout, "buffer", None)
+    if stream is None:
+        sys.stdout.write(text)
+        return
+    sys.stdout.flush()
+    stream.write(text.encode("utf-8"))
+    stream.flush()
+
+
+def _order_results(*sources: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield results from all sources ordered by result_sort_key.
+
+    Results are bucketed by rule ID and buckets are emitted in rule order, so
+    only each bucket is sorted by line rather than the combined results.
+    """
+    buckets: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for result in itertools.chain(*sources):
+        buckets[result.get("rule_id", "unknown")].append(result)
+
+    for rule_id in sorted(buckets):
+        bucket = buckets[rule_id]
+        bucket.sort(key=_result_line)
+        yield from bucket
+
+
+def _result_line(result: Dict[str, Any]) -> int:
+    """Line of a result, as used for ordering."""
+    return result.get("location", {}).get("line", 1)
+
+
+def _sanitize_each(
+    results: Iterable[Dict[str, Any]], sanitizer: Sanitizer
+) -> Iterator[Dict[str, Any]]:
+    """Sanitize results in place as they are consumed."""
+    for result in results:
+        sanitizer.sanitize_result_inplace(result)
+        yield result
+
+
+def parse_env_file(lines: Union[str, Iterable[str]]) -> dict:
+    """Parse .env file content, or an iterable of its lines, into a dictionary."""
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+
     env_vars = {}
-    for line_num, line in enumerate(content.splitlines(), start=1):
-        line = line.strip()
-        # Skip empty lines and comments
-        if not line or line.startswith("#"):
+    for line_num, line in enumerate(lines, start=1):
+        match = _ENV_LINE_RE.match(line)
+        if match is None:
             continue
-        # Parse KEY=VALUE
-        if "=" in line:
-            key, _, value = line.partition("=")
-            key = key.strip()
-            value = value.strip()
-            # Remove quotes if present
-            if value and value[0] == value[-1] and value[0] in ('"', "'"):
-                value = value[1:-1]
-            env_vars[key] = {"value": value, "line": line_num}
+        key, value = match.groups()
+        # Remove quotes if present
+        if value and value[0] == value[-1] and value[0] in ('"', "'"):
+            value = value[1:-1]
+        env_vars[key] = {"value": value, "line": line_num}
     return env_vars
 
 
@@ -162,50 +214,63 @@ def validate_policy(env_vars: dict, policy_rules: dict) -> list:
     results = []
 
     # Check required variables
-    if "required" in policy_rules:
-        for required_var in policy_rules["required"]:
-            if required_var not in env_vars:
-                results.append(
-                    {
-                        "rule_id": "missing-required-var",
-                        "level": "error",
-                        "message": f"Required environment variable '{required_var}' is missing",
-                        "location": {"line": 1},
-                    }
-                )
+    required = policy_rules.get("_required_set")
+    if required is None:
+        required = frozenset(policy_rules.get("required", ()))
+    for required_var in sorted(required - env_vars.keys()):
+        results.append(
+            {
+                "rule_id": "missing-required-var",
+                "level": "error",
+                "message": f"Required environment variable '{required_var}' is missing",
+                "location": {"line": 1},
+            }
+        )
 
     # Check forbidden variables
-    if "forbidden" in policy_rules:
-        for forbidden_var in policy_rules["forbidden"]:
-            if forbidden_var in env_vars:
-                results.append(
-                    {
-                        "rule_id": "forbidden-var",
-                        "level": "error",
-                        "message": f"Forbidden environment variable '{forbidden_var}' is present",
-                        "location": {"line": env_vars[forbidden_var]["line"]},
-                    }
-                )
+    forbidden = policy_rules.get("_forbidden_set")
+    if forbidden is None:
+        forbidden = frozenset(policy_rules.get("forbidden", ()))
+    for forbidden_var in sorted(forbidden & env_vars.keys()):
+        results.append(
+            {
+                "rule_id": "forbidden-var",
+                "level": "error",
+                "message": f"Forbidden environment variable '{forbidden_var}' is present",
+                "location": {"line": env_vars[forbidden_var]["line"]},
+            }
+        )
 
     # Check patterns
     if "patterns" in policy_rules:
-        import re
+        if "_pattern_rules" in policy_rules:
+            union = policy_rules["_pattern_union"]
+            rules = policy_rules["_pattern_rules"]
+        else:
+            union, rules = compile_pattern_rules(policy_rules["patterns"])
+
+        for var_name, var_data in env_vars.items():
+            # One match against the union finds the first rule that applies;
+            # later rules may still match the same variable
+            first = 0
+            if union is not None:
+                match = union.match(var_name)
+                if match is None:
+                    continue
+                first = int(match.lastgroup[2:])
 
-        for pattern_rule in policy_rules["patterns"]:
-            pattern = re.compile(pattern_rule["regex"])
-            for var_name, var_data in env_vars.items():
+            for pattern, message in rules[first:]:
                 if pattern.match(var_name):
-                    if pattern_rule.get("action") == "warn":
-                        results.append(
-                            {
-                                "rule_id": "pattern-match",
-                                "level": "warning",
-                                "message": pattern_rule.get(
-                                    "message", f"Variable '{var_name}' matches pattern"
-                                ),
-                                "location": {"line": var_data["line"]},
-                            }
-                        )
+                    if message is None:
+                        message = f"Variable '{var_name}' matches pattern"
+                    results.append(
+                        {
+                            "rule_id": "pattern-match",
+                            "level": "warning",
+                            "message": message,
+                            "location": {"line": var_data["line"]},
+                        }
+                    )
 
     return results
 
@@ -21,33 +21,24 @@ class Metrics:
             "policy_loaded": False,
         }
 
-    def record_file_size(self, size: int) -> None:
-        """Record size of analyzed file."""
-        self.metrics["file_size_bytes"] = size
+    def update(self, **values: Any) -> None:
+        """
+        Record several metrics at once.
 
-    def record_env_var_count(self, count: int) -> None:
-        """Record number of environment variables."""
-        self.metrics["env_var_count"] = count
+        Args:
+            **values: Metric values keyed by metric name
 
-    def record_schema_violations(self, count: int) -> None:
-        """Record number of schema validation violations."""
-        self.metrics["schema_violations"] = count
-
-    def record_secrets_found(self, count: int) -> None:
-        """Record number of secrets detected."""
-        self.metrics["secrets_found"] = count
-
-    def record_policy_violations(self, count: int) -> None:
-        """Record number of policy violations."""
-        self.metrics["policy_violations"] = count
-
-    def record_policy_loaded(self) -> None:
-        """Record that a policy was loaded."""
-        self.metrics["policy_loaded"] = True
+        Raises:
+            ValueError: If a metric name is unknown
+        """
+        unknown = values.keys() - self.metrics.keys()
+        if unknown:
+            raise ValueError(f"Unknown metrics: {', '.join(sorted(unknown))}")
+        self.metrics.update(values)
 
     def to_dict(self) -> Dict[str, Any]:
         """Export metrics as dictionary."""
-        return self.metrics.copy()
+        return dict(self.metrics)
 
     def get_total_violations(self) -> int:
         """Get total number of violations across all categories."""
@@ -2,11 +2,20 @@
 Policy file loader and validator.
 """
 
+import re
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Pattern, Tuple
 
 import yaml
 
+try:
+    # libyaml-backed parser and emitter
+    from yaml import CSafeDumper as _SafeDumper
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _SafeDumper  # type: ignore[assignment]
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+
 
 class PolicyLoader:
     """Load and validate policy files."""
@@ -32,7 +41,7 @@ class PolicyLoader:
         """
         try:
             with open(self.policy_path, "r") as f:
-                policy = yaml.safe_load(f)
+                policy = yaml.load(f, Loader=_SafeLoader)
 
             if policy is None:
                 raise ValueError("Policy file is empty")
@@ -40,6 +49,14 @@ class PolicyLoader:
             # Validate policy structure
             self._validate_policy(policy)
 
+            policy["_required_set"] = frozenset(policy.get("required", ()))
+            policy["_forbidden_set"] = frozenset(policy.get("forbidden", ()))
+
+            if "patterns" in policy:
+                union, rules = compile_pattern_rules(policy["patterns"])
+                policy["_pattern_union"] = union
+                policy["_pattern_rules"] = rules
+
             return policy
 
         except yaml.YAMLError as e:
@@ -91,11 +108,9 @@ class PolicyLoader:
                 if not isinstance(pattern["regex"], str):
                     raise ValueError("Pattern 'regex' must be a string")
 
-                # Validate regex is compilable
-                import re
-
+                # Validate regex is compilable and keep the compiled pattern
                 try:
-                    re.compile(pattern["regex"])
+                    pattern["_compiled"] = re.compile(pattern["regex"])
                 except re.error as e:
                     raise ValueError(f"Invalid regex pattern '{pattern['regex']}': {e}")
 
@@ -137,4 +152,49 @@ class PolicyLoader:
         }
 
         with open(output_path, "w") as f:
-            yaml.dump(example_policy, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(
+                example_policy,
+                f,
+                Dumper=_SafeDumper,
+                default_flow_style=False,
+                sort_keys=False,
+            )
+
+
+def compile_pattern_rules(
+    patterns: List[Dict[str, Any]],
+) -> Tuple[Optional[Pattern], List[Tuple[Pattern, Optional[str]]]]:
+    """
+    Compile 'warn' pattern rules into a single alternation.
+
+    Each rule becomes a named group, so one match against the union tells
+    whether any rule applies and which one matched first.
+
+    Args:
+        patterns: Items of the policy 'patterns' section
+
+    Returns:
+        Tuple of (union pattern, list of (pattern, message) per rule). The
+        union is None when the rules cannot be fused safely, e.g. when a
+        pattern uses its own groups, backreferences or inline flags.
+    """
+    rules = [
+        (pattern.get("_compiled") or re.compile(pattern["regex"]), pattern.get("message"))
+        for pattern in patterns
+        if pattern.get("action") == "warn"
+    ]
+    # Global inline flags such as (?i) would apply to the whole union (older
+    # Pythons only warn about them mid-pattern), so keep those rules separate
+    if not rules or any(
+        compiled.groups or compiled.flags & ~re.UNICODE for compiled, _ in rules
+    ):
+        return None, rules
+
+    try:
+        union = re.compile(
+            "|".join(f"(?P<_r{i}>{compiled.pattern})" for i, (compiled, _) in enumerate(rules))
+        )
+    except re.error:
+        return None, rules
+
+    return union, rules
@@ -3,12 +3,42 @@ Sanitizer for sensitive values in output.
 """
 
 import re
-from typing import Any, Dict, List
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # optional speedup, see the "speedups" extra
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:  # optional speedup, see the "speedups" extra
+    hyperscan = None
+
+
+def _stop_scan(*_: Any) -> bool:
+    """Hyperscan match handler that stops the scan at the first match."""
+    return True
 
 
 class Sanitizer:
     """Sanitize sensitive values in validation results."""
 
+    __slots__ = (
+        "redaction_text",
+        "preserve_length",
+        "sensitive_pattern",
+        "_key_set",
+        "_key_cache",
+        "_value_handlers",
+        "_key_automaton",
+        "_key_regex",
+        "_keyword_db",
+        "_scratch",
+        "_value_sub",
+    )
+
     # Patterns that indicate sensitive data
     SENSITIVE_PATTERNS = [
         r"password",
@@ -22,16 +52,80 @@ class Sanitizer:
         r"passphrase",
     ]
 
-    def __init__(self, redaction_text: str = "***REDACTED***"):
+    # Upper bound on remembered key verdicts per sanitizer
+    _KEY_CACHE_SIZE = 4096
+
+    def __init__(self, redaction_text: str = "***REDACTED***", preserve_length: bool = False):
         """
         Initialize sanitizer.
 
         Args:
             redaction_text: Text to use for redacted values
+            preserve_length: Overwrite secret strings with the redaction text
+                repeated or truncated to their length, so sanitized text keeps
+                its length and offsets
+
+        Raises:
+            ValueError: If preserve_length is set with an empty redaction text
         """
+        if preserve_length and not redaction_text:
+            raise ValueError("preserve_length requires a non-empty redaction_text")
         self.redaction_text = redaction_text
-        self.sensitive_pattern = re.compile(
-            "|".join(self.SENSITIVE_PATTERNS), re.IGNORECASE
+        self.preserve_length = preserve_length
+        patterns = "|".join(self.SENSITIVE_PATTERNS)
+        self.sensitive_pattern = re.compile(patterns, re.IGNORECASE)
+
+        # Literal keywords are matched with an Aho-Corasick automaton when
+        # pyahocorasick is installed; regex patterns still need the regex engine
+        literals = [p for p in self.SENSITIVE_PATTERNS if re.escape(p) == p]
+        self._key_set = frozenset(word.lower() for word in literals)
+        self._key_cache: Dict[str, bool] = {}
+
+        # Exact-type dispatch for walking detail values; other types are
+        # resolved by isinstance once and then added to the table
+        self._value_handlers: Dict[type, Callable[[Any, List[Tuple[Any, Any]]], Any]] = {
+            dict: self._walk_dict,
+            list: self._walk_list,
+            str: self._walk_str,
+            int: self._keep_value,
+            float: self._keep_value,
+            bool: self._keep_value,
+            type(None): self._keep_value,
+        }
+        self._key_automaton = None
+        self._key_regex = self.sensitive_pattern
+        if ahocorasick is not None and literals:
+            self._key_automaton = ahocorasick.Automaton()
+            for word in literals:
+                self._key_automaton.add_word(word.lower(), word)
+            self._key_automaton.make_automaton()
+            others = [p for p in self.SENSITIVE_PATTERNS if p not in literals]
+            self._key_regex = re.compile("|".join(others), re.IGNORECASE) if others else None
+
+        # Hyperscan database of the keyword patterns, used to rule out text
+        # with no sensitive keyword before running the regex substitution
+        self._keyword_db = None
+        if hyperscan is not None:
+            try:
+                self._keyword_db = hyperscan.Database()
+                self._keyword_db.compile(
+                    expressions=[p.encode() for p in self.SENSITIVE_PATTERNS],
+                    ids=list(range(len(self.SENSITIVE_PATTERNS))),
+                    elements=len(self.SENSITIVE_PATTERNS),
+                    flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH]
+                    * len(self.SENSITIVE_PATTERNS),
+                )
+            except hyperscan.error:
+                self._keyword_db = None
+        # Hyperscan scratch space cannot be shared by concurrent scans, so each
+        # thread scanning with this sanitizer allocates its own
+        self._scratch = threading.local()
+
+        # One pass over the text for both KEY=<value> and "sensitive_key": "value"
+        self._value_sub = re.compile(
+            rf'(?P<kv>\b(?:{patterns})[^=\s]*)\s*=\s*["\']?(?P<kv_value>[^"\'\s,;]+)["\']?'
+            rf'|(?P<json>["\'](?:{patterns})[^"\']*["\']\s*:\s*)["\'](?P<json_value>[^"\']+)["\']',
+            re.IGNORECASE,
         )
 
     def sanitize_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
@@ -45,79 +139,156 @@ class Sanitizer:
             Sanitized result
         """
         sanitized = result.copy()
+        self.sanitize_result_inplace(sanitized)
+        return sanitized
 
+    def sanitize_result_inplace(self, result: Dict[str, Any]) -> None:
+        """
+        Sanitize a single result without copying it.
+
+        Args:
+            result: Result dictionary to sanitize; its message and details
+                entries are replaced with sanitized versions
+        """
         # Sanitize message
-        if "message" in sanitized:
-            sanitized["message"] = self._sanitize_text(sanitized["message"])
+        if "message" in result:
+            result["message"] = self._sanitize_text(result["message"])
 
         # Sanitize details
-        if "details" in sanitized:
-            sanitized["details"] = self._sanitize_dict(sanitized["details"])
-
-        return sanitized
+        if "details" in result:
+            result["details"] = self._sanitize_dict(result["details"])
 
     def _sanitize_text(self, text: str) -> str:
         """Sanitize text that may contain sensitive values."""
-        # Look for patterns like KEY=value or "value"
-        # Redact values that appear to be sensitive
-        
-        # Pattern: KEY=<value>
-        text = re.sub(
-            r'(\b(?:' + '|'.join(self.SENSITIVE_PATTERNS) + r')[^=\s]*)\s*=\s*["\']?([^"\'\s,;]+)["\']?',
-            lambda m: f"{m.group(1)}={self.redaction_text}",
-            text,
-            flags=re.IGNORECASE
-        )
-        
-        # Pattern: "sensitive_key": "value"
-        text = re.sub(
-            r'(["\'](?:' + '|'.join(self.SENSITIVE_PATTERNS) + r')[^"\']*["\']\s*:\s*)["\']([^"\']+)["\']',
-            lambda m: f"{m.group(1)}\"{self.redaction_text}\"",
-            text,
-            flags=re.IGNORECASE
-        )
+        # Both substitutions need a sensitive keyword, so skip text without one
+        if not self._has_sensitive_keyword(text):
+            return text
 
-        return text
+        return self._value_sub.sub(self._redact_match, text)
+
+    def _has_sensitive_keyword(self, text: str) -> bool:
+        """Check whether text contains any sensitive keyword."""
+        # Hyperscan folds ASCII case only; other text keeps the regex's Unicode folding
+        if self._keyword_db is None or not text.isascii():
+            return self.sensitive_pattern.search(text) is not None
+        try:
+            self._keyword_db.scan(
+                text.encode("ascii"), match_event_handler=_stop_scan, scratch=self._thread_scratch()
+            )
+        except hyperscan.ScanTerminated:
+            return True
+        return False
+
+    def _thread_scratch(self) -> Any:
+        """Return this thread's Hyperscan scratch space for the keyword database."""
+        scratch = getattr(self._scratch, "value", None)
+        if scratch is None:
+            scratch = self._scratch.value = hyperscan.Scratch(self._keyword_db)
+        return scratch
+
+    def _redact_match(self, match: "re.Match[str]") -> str:
+        """Replacement for a sensitive KEY=value or "key": "value" match."""
+        if self.preserve_length:
+            # Keep the key, separator and quotes, overwrite only the value
+            value = "kv_value" if match.group("kv") is not None else "json_value"
+            start, end = match.span(value)
+            text = match.string
+            return (
+                text[match.start() : start]
+                + self._overwrite(end - start)
+                + text[end : match.end()]
+            )
+        key = match.group("kv")
+        if key is not None:
+            return f"{key}={self.redaction_text}"
+        return f'{match.group("json")}"{self.redaction_text}"'
 
     def _sanitize_dict(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Recursively sanitize dictionary values."""
-        sanitized = {}
-        for key, value in data.items():
-            # Check if key indicates sensitive data
-            if self._is_sensitive_key(key):
-                if isinstance(value, str) and value:
-                    sanitized[key] = self.redaction_text
-                elif isinstance(value, (dict, list)):
-                    sanitized[key] = self.redaction_text
-                else:
-                    sanitized[key] = value
-            elif isinstance(value, dict):
-                sanitized[key] = self._sanitize_dict(value)
-            elif isinstance(value, list):
-                sanitized[key] = self._sanitize_list(value)
-            elif isinstance(value, str):
-                sanitized[key] = self._sanitize_text(value)
+        """Sanitize nested dictionary values, walking the tree with an explicit stack."""
+        sanitized: Dict[str, Any] = {}
+        stack: List[Tuple[Any, Any]] = [(data, sanitized)]
+        while stack:
+            source, target = stack.pop()
+            if isinstance(source, dict):
+                for key, value in source.items():
+                    # Check if key indicates sensitive data
+                    if self._is_sensitive_key(key):
+                        if (isinstance(value, str) and value) or isinstance(value, (dict, list)):
+                            target[key] = self._redact(value)
+                        else:
+                            target[key] = value
+                    else:
+                        target[key] = self._sanitize_value(value, stack)
             else:
-                sanitized[key] = value
+                for item in source:
+                    target.append(self._sanitize_value(item, stack))
 
         return sanitized
 
-    def _sanitize_list(self, data: List[Any]) -> List[Any]:
-        """Recursively sanitize list values."""
-        sanitized = []
-        for item in data:
-            if isinstance(item, dict):
-                sanitized.append(self._sanitize_dict(item))
-            elif isinstance(item, list):
-                sanitized.append(self._sanitize_list(item))
-            elif isinstance(item, str):
-                sanitized.append(self._sanitize_text(item))
-            else:
-                sanitized.append(item)
-        return sanitized
+    def _sanitize_value(self, value: Any, stack: List[Tuple[Any, Any]]) -> Any:
+        """
+        Sanitize a single value.
+
+        Containers are returned empty and queued on the stack to be filled in,
+        which keeps their position in the parent without recursing.
+        """
+        handler = self._value_handlers.get(type(value))
+        if handler is None:
+            handler = self._resolve_value_handler(type(value))
+        return handler(value, stack)
+
+    def _resolve_value_handler(self, cls: type) -> Callable[[Any, List[Tuple[Any, Any]]], Any]:
+        """Pick and remember the handler for a type not in the dispatch table."""
+        if issubclass(cls, dict):
+            handler = self._walk_dict
+        elif issubclass(cls, list):
+            handler = self._walk_list
+        elif issubclass(cls, str):
+            handler = self._walk_str
+        else:
+            handler = self._keep_value
+        self._value_handlers[cls] = handler
+        return handler
+
+    def _walk_dict(self, value: Dict[str, Any], stack: List[Tuple[Any, Any]]) -> Dict[str, Any]:
+        """Queue a dict to be sanitized into a new, empty dict."""
+        child: Dict[str, Any] = {}
+        stack.append((value, child))
+        return child
+
+    def _walk_list(self, value: List[Any], stack: List[Tuple[Any, Any]]) -> List[Any]:
+        """Queue a list to be sanitized into a new, empty list."""
+        child: List[Any] = []
+        stack.append((value, child))
+        return child
+
+    def _walk_str(self, value: str, stack: List[Tuple[Any, Any]]) -> str:
+        """Sanitize a string value."""
+        return self._sanitize_text(value)
+
+    def _keep_value(self, value: Any, stack: List[Tuple[Any, Any]]) -> Any:
+        """Pass a value that cannot hold secrets through unchanged."""
+        return value
 
     def _is_sensitive_key(self, key: str) -> bool:
         """Check if a key name indicates sensitive data."""
+        # The same few key names recur across results, so remember the verdicts
+        cached = self._key_cache.get(key)
+        if cached is None:
+            if len(self._key_cache) >= self._KEY_CACHE_SIZE:
+                self._key_cache.clear()
+            cached = self._key_cache[key] = self._match_sensitive_key(key)
+        return cached
+
+    def _match_sensitive_key(self, key: str) -> bool:
+        """Match a key name against the sensitive patterns."""
+        lowered = key.lower()
+        if lowered in self._key_set:
+            return True
+        if self._key_automaton is not None:
+            if next(self._key_automaton.iter(lowered), None) is not None:
+                return True
+            return self._key_regex is not None and self._key_regex.search(key) is not None
         return bool(self.sensitive_pattern.search(key))
 
     def sanitize_env_vars(self, env_vars: Dict[str, Any]) -> Dict[str, Any]:
@@ -130,13 +301,25 @@ class Sanitizer:
         Returns:
             Sanitized dictionary
         """
-        sanitized = {}
-        for key, value in env_vars.items():
-            if self._is_sensitive_key(key):
-                if isinstance(value, dict) and "value" in value:
-                    sanitized[key] = {**value, "value": self.redaction_text}
-                else:
-                    sanitized[key] = self.redaction_text
-            else:
-                sanitized[key] = value
-        return sanitized
+        # Non-sensitive entries are shared with the input, only redacted ones are copied
+        return {
+            key: self._redact_env_value(value) if self._is_sensitive_key(key) else value
+            for key, value in env_vars.items()
+        }
+
+    def _redact_env_value(self, value: Any) -> Any:
+        """Redact a sensitive environment variable, keeping its metadata."""
+        if isinstance(value, dict) and "value" in value:
+            return {**value, "value": self._redact(value["value"])}
+        return self._redact(value)
+
+    def _redact(self, value: Any) -> Any:
+        """Redaction replacing a whole sensitive value."""
+        if self.preserve_length and isinstance(value, str):
+            return self._overwrite(len(value))
+        return self.redaction_text
+
+    def _overwrite(self, length: int) -> str:
+        """Redaction text repeated and truncated to exactly `length` characters."""
+        token = self.redaction_text
+        return (token * (length // len(token) + 1))[:length]
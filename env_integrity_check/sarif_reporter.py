@@ -2,14 +2,121 @@
 SARIF 2.1.0 report generator for deterministic CI/CD integration.
 """
 
+import functools
 import hashlib
+import json
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, TextIO, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "speedups" extra
+    orjson = None
+
+SARIF_SCHEMA_URI = "https://json.schemastore.org/sarif-2.1.0.json"
+
+# Internal result level -> SARIF level; anything else maps to "warning"
+_LEVEL_MAP = {
+    "error": "error",
+    "warning": "warning",
+    "info": "note",
+    "note": "note",
+}
+
+
+def result_sort_key(result: Dict[str, Any]) -> tuple:
+    """Sort key giving the deterministic (rule ID, line) order of SARIF results."""
+    return (result.get("rule_id", "unknown"), result.get("location", {}).get("line", 1))
+
+
+class Finding(NamedTuple):
+    """A result's fields, read once from its dict for SARIF conversion."""
+
+    rule_id: str
+    level: str
+    message: str
+    line: int
+    column: int
+    details: Optional[Dict[str, Any]]
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> "Finding":
+        """Build a Finding from an internal result dict, applying defaults."""
+        location = result.get("location", {})
+        return cls(
+            result.get("rule_id", "unknown"),
+            result.get("level", "warning"),
+            result.get("message", "Validation error"),
+            location.get("line", 1),
+            location.get("column", 1),
+            result.get("details"),
+        )
+
+
+def _dumps(value: Any) -> str:
+    """
+    Serialize value as JSON indented by two spaces, using orjson if installed.
+
+    Both paths write non-ASCII text as-is and accept the non-string keys
+    json.dumps does, so the output does not depend on the speedups extra.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value, indent=2, ensure_ascii=False)
+
+
+def _indent_json(value: Any, level: int) -> str:
+    """Serialize value as indented JSON nested `level` spaces deep."""
+    return _dumps(value).replace("\n", "\n" + " " * level)
 
 
 class SARIFReporter:
     """Generate SARIF 2.1.0 compliant reports."""
 
+    __slots__ = ("tool_name", "tool_version")
+
+    # Name, description and help for the rules emitted by this tool
+    _RULE_METADATA: Dict[str, Dict[str, Any]] = {
+        "schema-validation": {
+            "name": "Schema Validation",
+            "shortDescription": {"text": "Schema validation error"},
+            "help": {
+                "text": "Environment variable does not match expected schema type or format."
+            },
+        },
+        "missing-required-field": {
+            "name": "Missing Required Field",
+            "shortDescription": {"text": "Required field is missing"},
+            "help": {
+                "text": "A required field defined in the schema is not present in the "
+                "environment file."
+            },
+        },
+        "missing-required-var": {
+            "name": "Missing Required Var",
+            "shortDescription": {"text": "Required environment variable is missing"},
+            "help": {"text": "A required environment variable specified in policy is missing."},
+        },
+        "forbidden-var": {
+            "name": "Forbidden Var",
+            "shortDescription": {"text": "Forbidden environment variable detected"},
+            "help": {"text": "An environment variable that is forbidden by policy is present."},
+        },
+        "pattern-match": {
+            "name": "Pattern Match",
+            "shortDescription": {"text": "Environment variable matches warning pattern"},
+            "help": {"text": "Environment variable name matches a pattern defined in policy."},
+        },
+        "secret-detected": {
+            "name": "Secret Detected",
+            "shortDescription": {"text": "Potential secret detected in environment file"},
+            "help": {
+                "text": "Potential secret or sensitive credential detected by secrets scanner."
+            },
+        },
+    }
+
     def __init__(self, tool_name: str, tool_version: str):
         """
         Initialize SARIF reporter.
@@ -26,6 +133,7 @@ class SARIFReporter:
         results: List[Dict[str, Any]],
         source_file: str,
         metrics_data: Optional[Dict[str, Any]] = None,
+        pre_sorted: bool = False,
     ) -> Dict[str, Any]:
         """
         Generate SARIF 2.1.0 report.
@@ -34,87 +142,148 @@ class SARIFReporter:
             results: List of validation/scanning results
             source_file: Path to the analyzed file
             metrics_data: Optional metrics to include in report
+            pre_sorted: Whether results are already ordered by result_sort_key,
+                in which case they are not sorted again
 
         Returns:
             SARIF report as dictionary
         """
-        # Build rules dictionary
-        rules = self._extract_rules(results)
-
-        # Convert results to SARIF format
-        sarif_results = []
+        # Convert results to SARIF format, keeping each one's (rule ID, line) key
+        # and collecting the rule descriptors in the same pass
+        keyed_results = []
+        rules: Dict[str, Dict[str, Any]] = {}
+        prefix_hashers: Dict[str, Any] = {}
         for result in results:
-            sarif_result = self._convert_to_sarif_result(result, source_file)
-            sarif_results.append(sarif_result)
+            finding = Finding.from_result(result)
+            if finding.rule_id not in rules:
+                rules[finding.rule_id] = self._rule_descriptor(finding.rule_id, finding.level)
+            sarif_result = self._convert_to_sarif_result(finding, source_file, prefix_hashers)
+            keyed_results.append((finding.rule_id, finding.line, sarif_result))
 
         # Sort results for deterministic output
-        sarif_results.sort(key=lambda x: (x["ruleId"], x["locations"][0]["physicalLocation"]["region"]["startLine"]))
+        if not pre_sorted:
+            keyed_results.sort(key=itemgetter(0, 1))
+        sarif_results = [sarif_result for _, _, sarif_result in keyed_results]
+
+        run = {
+            "tool": self._build_tool(rules),
+            "results": sarif_results,
+            "columnKind": "utf16CodeUnits",
+        }
+
+        # Add metrics as properties only if provided
+        if metrics_data:
+            run["properties"] = {"metrics": metrics_data}
 
         # Build SARIF structure
-        sarif_report = {
+        return {
             "version": "2.1.0",
-            "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
-            "runs": [
-                {
-                    "tool": {
-                        "driver": {
-                            "name": self.tool_name,
-                            "version": self.tool_version,
-                            "informationUri": "https://github.com/canstralian/env-integrity-checK",
-                            "rules": rules,
-                        }
-                    },
-                    "results": sarif_results,
-                    "columnKind": "utf16CodeUnits",
-                }
-            ],
+            "$schema": SARIF_SCHEMA_URI,
+            "runs": [run],
         }
 
-        # Add metrics as properties if provided
-        if metrics_data:
-            sarif_report["runs"][0]["properties"] = {
-                "metrics": metrics_data
-            }
+    def stream_report(
+        self,
+        results: Iterable[Dict[str, Any]],
+        source_file: str,
+        fh: TextIO,
+        metrics_data: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Write a SARIF 2.1.0 report to a file handle one result at a time.
+
+        Results are not sorted here, so callers must pass them already ordered
+        by result_sort_key. Rules are collected while the results are written,
+        which is why the tool section follows the results array.
 
-        return sarif_report
+        Args:
+            results: Validation/scanning results, ordered by rule ID and line
+            source_file: Path to the analyzed file
+            fh: Text file handle to write the report to
+            metrics_data: Optional metrics to include in report
 
-    def _extract_rules(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Extract unique rules from results."""
-        rules_dict = {}
+        Returns:
+            Number of results written
+        """
+        fh.write(
+            "{\n"
+            '  "version": "2.1.0",\n'
+            f'  "$schema": {json.dumps(SARIF_SCHEMA_URI)},\n'
+            '  "runs": [\n'
+            "    {\n"
+            '      "results": ['
+        )
 
+        # Rule descriptors, built from the first result seen for each rule
+        rules: Dict[str, Dict[str, Any]] = {}
+        prefix_hashers: Dict[str, Any] = {}
+        count = 0
         for result in results:
-            rule_id = result.get("rule_id", "unknown")
-            if rule_id not in rules_dict:
-                rules_dict[rule_id] = {
-                    "id": rule_id,
-                    "name": self._rule_id_to_name(rule_id),
-                    "shortDescription": {
-                        "text": self._get_rule_description(rule_id)
-                    },
-                    "help": {
-                        "text": self._get_rule_help(rule_id)
-                    },
-                    "defaultConfiguration": {
-                        "level": self._map_level(result.get("level", "warning"))
-                    },
-                }
+            finding = Finding.from_result(result)
+            if finding.rule_id not in rules:
+                rules[finding.rule_id] = self._rule_descriptor(finding.rule_id, finding.level)
+            sarif_result = self._convert_to_sarif_result(finding, source_file, prefix_hashers)
+            fh.write(",\n        " if count else "\n        ")
+            fh.write(_indent_json(sarif_result, 8))
+            count += 1
+        fh.write("\n      ]," if count else "],")
 
-        # Sort rules by ID for deterministic output
-        return sorted(rules_dict.values(), key=lambda x: x["id"])
+        run_tail = {
+            "tool": self._build_tool(rules),
+            "columnKind": "utf16CodeUnits",
+        }
+        if metrics_data:
+            run_tail["properties"] = {"metrics": metrics_data}
+
+        fh.write(
+            ",".join(
+                f"\n      {json.dumps(key)}: {_indent_json(value, 6)}"
+                for key, value in run_tail.items()
+            )
+        )
+        fh.write("\n    }\n  ]\n}")
+
+        return count
+
+    def _build_tool(self, rules: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the SARIF tool section from rule descriptors keyed by rule ID."""
+        return {
+            "driver": {
+                "name": self.tool_name,
+                "version": self.tool_version,
+                "informationUri": "https://github.com/canstralian/env-integrity-checK",
+                # Sort rules by ID for deterministic output
+                "rules": [rules[rule_id] for rule_id in sorted(rules)],
+            }
+        }
+
+    def _rule_descriptor(self, rule_id: str, level: str) -> Dict[str, Any]:
+        """Build the rule descriptor for a rule from the level of its first result."""
+        # Built fresh each time; only the strings are shared with the cache
+        name, short_description, help_text = self._rule_metadata(rule_id)
+        return {
+            "id": rule_id,
+            "name": name,
+            "shortDescription": {"text": short_description},
+            "help": {"text": help_text},
+            "defaultConfiguration": {
+                "level": self._map_level(level)
+            },
+        }
 
     def _convert_to_sarif_result(
-        self, result: Dict[str, Any], source_file: str
+        self,
+        finding: Finding,
+        source_file: str,
+        prefix_hashers: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        """Convert internal result format to SARIF result."""
-        rule_id = result.get("rule_id", "unknown")
-        level = self._map_level(result.get("level", "warning"))
-        message = result.get("message", "Validation error")
-        location = result.get("location", {})
-
+        """Convert a finding to a SARIF result."""
+        # Built as a single literal, fingerprint included, so each result is
+        # allocated in one go rather than patched afterwards
         sarif_result = {
-            "ruleId": rule_id,
-            "level": level,
-            "message": {"text": message},
+            "ruleId": finding.rule_id,
+            "level": self._map_level(finding.level),
+            "message": {"text": finding.message},
             "locations": [
                 {
                     "physicalLocation": {
@@ -122,67 +291,88 @@ class SARIFReporter:
                             "uri": source_file,
                         },
                         "region": {
-                            "startLine": location.get("line", 1),
-                            "startColumn": location.get("column", 1),
+                            "startLine": finding.line,
+                            "startColumn": finding.column,
                         },
                     }
                 }
             ],
-        }
-
-        # Add fingerprint for deterministic matching
-        sarif_result["fingerprints"] = {
-            "primary": self._generate_fingerprint(rule_id, source_file, location)
+            # Fingerprint for deterministic matching
+            "fingerprints": {
+                "primary": self._line_fingerprint(
+                    finding.rule_id, source_file, finding.line, prefix_hashers
+                )
+            },
         }
 
         # Add additional properties if present
-        if "details" in result:
-            sarif_result["properties"] = result["details"]
+        if finding.details is not None:
+            sarif_result["properties"] = finding.details
 
         return sarif_result
 
     def _map_level(self, level: str) -> str:
         """Map internal level to SARIF level."""
-        level_map = {
-            "error": "error",
-            "warning": "warning",
-            "info": "note",
-            "note": "note",
-        }
-        return level_map.get(level.lower(), "warning")
-
-    def _rule_id_to_name(self, rule_id: str) -> str:
-        """Convert rule ID to human-readable name."""
-        return rule_id.replace("-", " ").replace("_", " ").title()
-
-    def _get_rule_description(self, rule_id: str) -> str:
-        """Get short description for rule."""
-        descriptions = {
-            "schema-validation": "Schema validation error",
-            "missing-required-field": "Required field is missing",
-            "missing-required-var": "Required environment variable is missing",
-            "forbidden-var": "Forbidden environment variable detected",
-            "pattern-match": "Environment variable matches warning pattern",
-            "secret-detected": "Potential secret detected in environment file",
-        }
-        return descriptions.get(rule_id, f"Rule {rule_id}")
-
-    def _get_rule_help(self, rule_id: str) -> str:
-        """Get help text for rule."""
-        help_texts = {
-            "schema-validation": "Environment variable does not match expected schema type or format.",
-            "missing-required-field": "A required field defined in the schema is not present in the environment file.",
-            "missing-required-var": "A required environment variable specified in policy is missing.",
-            "forbidden-var": "An environment variable that is forbidden by policy is present.",
-            "pattern-match": "Environment variable name matches a pattern defined in policy.",
-            "secret-detected": "Potential secret or sensitive credential detected by secrets scanner.",
-        }
-        return help_texts.get(rule_id, f"Validation rule: {rule_id}")
+        return _LEVEL_MAP.get(level.lower(), "warning")
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _rule_metadata(rule_id: str) -> Tuple[str, str, str]:
+        """Get name, description and help text for rule."""
+        metadata = SARIFReporter._RULE_METADATA.get(rule_id)
+        if metadata is None:
+            return (
+                rule_id.replace("-", " ").replace("_", " ").title(),
+                f"Rule {rule_id}",
+                f"Validation rule: {rule_id}",
+            )
+        return (
+            metadata["name"],
+            metadata["shortDescription"]["text"],
+            metadata["help"]["text"],
+        )
 
     def _generate_fingerprint(
-        self, rule_id: str, file_path: str, location: Dict[str, Any]
+        self,
+        rule_id: str,
+        file_path: str,
+        location: Dict[str, Any],
+        prefix_hashers: Optional[Dict[str, Any]] = None,
     ) -> str:
-        """Generate deterministic fingerprint for result."""
+        """
+        Generate deterministic fingerprint for result.
+
+        Args:
+            rule_id: Rule that produced the result
+            file_path: Path to the analyzed file
+            location: Result location
+            prefix_hashers: Optional per-report cache of BLAKE2b states already
+                fed with the "rule_id:file_path:" prefix, keyed by rule ID.
+                Only valid for a single file_path.
+
+        Returns:
+            32 character hex fingerprint (128-bit BLAKE2b digest)
+        """
+        return self._line_fingerprint(
+            rule_id, file_path, location.get("line", 1), prefix_hashers
+        )
+
+    def _line_fingerprint(
+        self,
+        rule_id: str,
+        file_path: str,
+        line: int,
+        prefix_hashers: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Fingerprint a result from its rule, file and line; see _generate_fingerprint."""
         # Create a stable identifier based on rule, file, and location
-        fingerprint_data = f"{rule_id}:{file_path}:{location.get('line', 1)}"
-        return hashlib.sha256(fingerprint_data.encode()).hexdigest()[:16]
+        if prefix_hashers is None:
+            prefix_hashers = {}
+        base = prefix_hashers.get(rule_id)
+        if base is None:
+            base = hashlib.blake2b(f"{rule_id}:{file_path}:".encode(), digest_size=16)
+            prefix_hashers[rule_id] = base
+
+        hasher = base.copy()
+        hasher.update(str(line).encode())
+        return hasher.hexdigest()
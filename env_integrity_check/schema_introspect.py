@@ -2,14 +2,81 @@
 Schema introspection for Pydantic models.
 """
 
+import functools
 import importlib.util
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from weakref import WeakKeyDictionary
 
 from pydantic import BaseModel, ValidationError
 
 
+@functools.lru_cache(maxsize=128)
+def _load_model(schema_path: str, mtime_ns: int, size: int) -> type[BaseModel]:
+    """
+    Load the first Pydantic model from a schema file.
+
+    Cached on the path, modification time and size, so the module is only
+    executed again when the file changes.
+    """
+    # Load module from file
+    spec = importlib.util.spec_from_file_location("schema_module", schema_path)
+    if spec is None or spec.loader is None:
+        raise ValueError(f"Cannot load schema from {schema_path}")
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["schema_module"] = module
+    spec.loader.exec_module(module)
+
+    # Find first BaseModel subclass
+    for attr_name in dir(module):
+        attr = getattr(module, attr_name)
+        if (
+            isinstance(attr, type)
+            and issubclass(attr, BaseModel)
+            and attr is not BaseModel
+        ):
+            return attr
+
+    raise ValueError(f"No Pydantic BaseModel found in {schema_path}")
+
+
+# (name, required, type) for each model field, in declaration order
+FieldSnapshot = Tuple[Tuple[str, bool, str], ...]
+ModelSnapshot = Tuple[FieldSnapshot, Tuple[str, ...]]
+
+# Weakly keyed so model classes evicted from the loader cache can be freed;
+# the cached values must not reference the class, or they would pin it
+_SNAPSHOT_CACHE: "WeakKeyDictionary[type, ModelSnapshot]" = WeakKeyDictionary()
+_SCHEMA_INFO_CACHE: "WeakKeyDictionary[type, Dict[str, Any]]" = WeakKeyDictionary()
+
+
+def _model_snapshot(model_class: type[BaseModel]) -> ModelSnapshot:
+    """
+    Return the field metadata and required field names for a model class.
+
+    The Pydantic v1/v2 dispatch happens once per class.
+    """
+    cached = _SNAPSHOT_CACHE.get(model_class)
+    if cached is None:
+        if hasattr(model_class, "model_fields"):
+            # Pydantic v2
+            fields = tuple(
+                (name, info.is_required(), str(info.annotation))
+                for name, info in model_class.model_fields.items()
+            )
+        else:
+            # Pydantic v1
+            fields = tuple(
+                (name, field.required, str(field.type_))
+                for name, field in model_class.__fields__.items()
+            )
+        required = tuple(name for name, is_required, _ in fields if is_required)
+        cached = _SNAPSHOT_CACHE[model_class] = (fields, required)
+    return cached
+
+
 class SchemaIntrospector:
     """Introspect and validate against Pydantic schemas."""
 
@@ -22,29 +89,13 @@ class SchemaIntrospector:
         """
         self.schema_path = schema_path
         self.model_class = self._load_schema()
+        # Warms the per-class cache; required names are kept in declaration order
+        _, self._required_names = _model_snapshot(self.model_class)
 
     def _load_schema(self) -> type[BaseModel]:
-        """Load Pydantic model from schema file."""
-        # Load module from file
-        spec = importlib.util.spec_from_file_location("schema_module", self.schema_path)
-        if spec is None or spec.loader is None:
-            raise ValueError(f"Cannot load schema from {self.schema_path}")
-
-        module = importlib.util.module_from_spec(spec)
-        sys.modules["schema_module"] = module
-        spec.loader.exec_module(module)
-
-        # Find first BaseModel subclass
-        for attr_name in dir(module):
-            attr = getattr(module, attr_name)
-            if (
-                isinstance(attr, type)
-                and issubclass(attr, BaseModel)
-                and attr is not BaseModel
-            ):
-                return attr
-
-        raise ValueError(f"No Pydantic BaseModel found in {self.schema_path}")
+        """Load Pydantic model from schema file, reusing it while the file is unchanged."""
+        st = self.schema_path.stat()
+        return _load_model(str(self.schema_path), st.st_mtime_ns, st.st_size)
 
     def validate_env_vars(self, env_vars: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -58,12 +109,20 @@ class SchemaIntrospector:
         """
         results = []
 
-        # Extract just the values for validation
+        # Pydantic v1 has no compiled core validator
+        validator = getattr(self.model_class, "__pydantic_validator__", None)
+
+        # Extract just the values for validation. This stays a real dict:
+        # user model validators may expect one, and pydantic-core validates a
+        # dict faster than a lazy Mapping view over the parsed metadata
         env_values = {key: data["value"] for key, data in env_vars.items()}
 
         try:
-            # Try to validate
-            self.model_class(**env_values)
+            # Validate against the compiled core schema directly when available
+            if validator is not None:
+                validator.validate_python(env_values)
+            else:
+                self.model_class(**env_values)
         except ValidationError as e:
             # Convert Pydantic errors to our format
             for error in e.errors():
@@ -85,60 +144,39 @@ class SchemaIntrospector:
                 )
 
         # Check for required fields that are missing
-        if hasattr(self.model_class, "model_fields"):
-            # Pydantic v2
-            model_fields = self.model_class.model_fields
-            for field_name, field_info in model_fields.items():
-                if field_info.is_required() and field_name not in env_vars:
-                    results.append(
-                        {
-                            "rule_id": "missing-required-field",
-                            "level": "error",
-                            "message": f"Required field '{field_name}' is missing",
-                            "location": {"line": 1},
-                            "details": {
-                                "field": field_name,
-                            },
-                        }
-                    )
-        else:
-            # Pydantic v1 fallback
-            for field_name, field in self.model_class.__fields__.items():
-                if field.required and field_name not in env_vars:
-                    results.append(
-                        {
-                            "rule_id": "missing-required-field",
-                            "level": "error",
-                            "message": f"Required field '{field_name}' is missing",
-                            "location": {"line": 1},
-                            "details": {
-                                "field": field_name,
-                            },
-                        }
-                    )
+        for field_name in self._required_names:
+            if field_name not in env_vars:
+                results.append(
+                    {
+                        "rule_id": "missing-required-field",
+                        "level": "error",
+                        "message": f"Required field '{field_name}' is missing",
+                        "location": {"line": 1},
+                        "details": {
+                            "field": field_name,
+                        },
+                    }
+                )
 
         return results
 
     def get_schema_info(self) -> Dict[str, Any]:
-        """Get schema metadata information."""
-        info = {
-            "model_name": self.model_class.__name__,
-            "fields": {},
-        }
+        """
+        Get schema metadata information.
 
-        if hasattr(self.model_class, "model_fields"):
-            # Pydantic v2
-            for field_name, field_info in self.model_class.model_fields.items():
-                info["fields"][field_name] = {
-                    "required": field_info.is_required(),
-                    "type": str(field_info.annotation),
-                }
-        else:
-            # Pydantic v1
-            for field_name, field in self.model_class.__fields__.items():
-                info["fields"][field_name] = {
-                    "required": field.required,
-                    "type": str(field.type_),
-                }
+        The result is built once per model class and shared between calls,
+        so callers should treat it as read-only.
+        """
+        info = _SCHEMA_INFO_CACHE.get(self.model_class)
+        if info is None:
+            fields, _ = _model_snapshot(self.model_class)
+            info = {
+                "model_name": self.model_class.__name__,
+                "fields": {
+                    field_name: {"required": required, "type": type_name}
+                    for field_name, required, type_name in fields
+                },
+            }
+            _SCHEMA_INFO_CACHE[self.model_class] = info
 
         return info
@@ -2,12 +2,112 @@
 Secrets detection using detect-secrets library.
 """
 
-import tempfile
+import functools
+import io
+import re
+import sys
+import threading
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import IO, Any, Callable, Dict, Iterator, List, Sequence, Set, Tuple
 
-from detect_secrets import SecretsCollection
-from detect_secrets.settings import default_settings
+from detect_secrets.core.potential_secret import PotentialSecret
+from detect_secrets.core.scan import _is_filtered_out, _scan_line
+from detect_secrets.plugins.base import BasePlugin, RegexBasedDetector
+from detect_secrets.settings import default_settings, get_plugins
+from detect_secrets.transformers import get_transformed_file
+from detect_secrets.util.code_snippet import get_code_snippet
+
+try:
+    import hyperscan
+except ImportError:  # optional speedup, see the "speedups" extra
+    hyperscan = None
+
+
+def _stop_scan(*_: Any) -> bool:
+    """Hyperscan match handler that stops the scan at the first match."""
+    return True
+
+
+def _denylist_prefilter(plugins: Sequence[BasePlugin]) -> Tuple[Any, Tuple[BasePlugin, ...]]:
+    """
+    Compile the denylists of plain regex-based plugins into one Hyperscan database.
+
+    The database is built in prefilter mode, so it matches at least every line
+    one of those plugins could report; lines it does not match can skip them
+    all. Plugins with their own analyze_string always run. Without Hyperscan
+    there is no prefilter, since a combined Python regex alternation is no
+    faster than running the plugin patterns one by one.
+
+    Args:
+        plugins: Configured detect-secrets plugins
+
+    Returns:
+        The compiled database (None if unavailable) and the plugins that must
+        run on every line
+    """
+    if hyperscan is None:
+        return None, tuple(plugins)
+
+    expressions = []
+    flags = []
+    always_run = []
+    for plugin in plugins:
+        if (
+            not isinstance(plugin, RegexBasedDetector)
+            or type(plugin).analyze_string is not RegexBasedDetector.analyze_string
+        ):
+            always_run.append(plugin)
+            continue
+        for regex in plugin.denylist:
+            pattern_flags = hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH
+            pattern_flags |= hyperscan.HS_FLAG_ALLOWEMPTY
+            if regex.flags & re.IGNORECASE:
+                pattern_flags |= hyperscan.HS_FLAG_CASELESS
+            if regex.flags & re.MULTILINE:
+                pattern_flags |= hyperscan.HS_FLAG_MULTILINE
+            if regex.flags & re.DOTALL:
+                pattern_flags |= hyperscan.HS_FLAG_DOTALL
+            pattern = regex.pattern
+            if regex.flags & re.VERBOSE:
+                pattern = "(?x)" + pattern
+            expressions.append(pattern.encode())
+            flags.append(pattern_flags)
+
+    if not expressions:
+        return None, tuple(plugins)
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=flags,
+        )
+    except hyperscan.error:
+        return None, tuple(plugins)
+    return database, tuple(always_run)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_plugins() -> Tuple[Tuple[BasePlugin, ...], Any, Tuple[BasePlugin, ...]]:
+    """
+    Instantiate the default plugin set and its prefilter once per process.
+
+    The plugins keep their compiled patterns after the settings context
+    exits, and scanners only read them, so every instance shares them.
+
+    Returns:
+        The plugins, the denylist prefilter and the plugins it cannot skip
+    """
+    with default_settings():
+        plugins = tuple(get_plugins())
+    return (plugins,) + _denylist_prefilter(plugins)
+
+
+class _MemoryFile(io.StringIO):
+    """In-memory content with the file name detect-secrets' transformers expect."""
+
+    name = "<memory>"
 
 
 class SecretsScanner:
@@ -16,6 +116,10 @@ class SecretsScanner:
     def __init__(self):
         """Initialize secrets scanner."""
         self.settings = default_settings
+        self._plugins, self._prefilter, self._unfiltered_plugins = _load_plugins()
+        # Hyperscan scratch space cannot be shared by concurrent scans, so each
+        # thread scanning with this scanner allocates its own
+        self._scratch = threading.local()
 
     def scan_env_file(
         self, file_path: Path, env_vars: Dict[str, Any]
@@ -30,49 +134,100 @@ class SecretsScanner:
         Returns:
             List of detected secrets as results
         """
-        results = []
+        return list(self.scan_env_vars_batched(file_path, env_vars))
 
-        try:
-            # Create a secrets collection
-            secrets = SecretsCollection()
+    def scan_env_vars_batched(
+        self, file_path: Path, env_vars: Dict[str, Any], batch_size: int = 200
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Scan every line of an environment file for secrets, in batches.
 
-            # Scan the file
-            with open(file_path, "r") as f:
-                secrets.scan_file(str(file_path))
+        Findings are yielded as each batch of batch_size lines completes
+        instead of after the whole file. Secrets on lines that define no
+        parsed variable, such as comments, are reported without a variable.
+        Like detect-secrets' SecretsCollection, a secret repeated on several
+        lines is reported once, at its first line.
 
-            # Process detected secrets
-            for filename, file_secrets in secrets.data.items():
-                for secret in file_secrets:
-                    # Find which env var this secret belongs to
-                    line_num = secret.line_number
-                    var_name = self._find_var_at_line(env_vars, line_num)
+        Args:
+            file_path: Path to the .env file
+            env_vars: Parsed environment variables with metadata
+            batch_size: Number of lines to scan per batch
 
-                    results.append(
-                        {
-                            "rule_id": "secret-detected",
-                            "level": "error",
-                            "message": f"Potential {secret.type} detected in {var_name or 'environment file'}",
-                            "location": {
-                                "line": line_num,
-                            },
-                            "details": {
-                                "secret_type": secret.type,
-                                "variable": var_name,
-                            },
-                        }
-                    )
+        Yields:
+            Detected secrets as results
+        """
+        line_to_var = self._line_index(env_vars)
+        filename = str(file_path)
+
+        try:
+            if _is_filtered_out(required_filter_parameters=["filename"], filename=filename):
+                return
+
+            for secrets in self._scan_source(
+                filename, lambda: open(file_path, "r"), batch_size
+            ):
+                yield from self._secret_results(secrets, line_to_var)
 
         except Exception as e:
             # If detect-secrets fails, log but don't fail the entire scan
+            yield {
+                "rule_id": "secrets-scan-error",
+                "level": "warning",
+                "message": f"Secrets scanning encountered an error: {str(e)}",
+                "location": {"line": 1},
+            }
+
+    def _scan_source(
+        self, filename: str, open_source: Callable[[], IO[str]], batch_size: int
+    ) -> Iterator[List[PotentialSecret]]:
+        """
+        Scan a source the way detect-secrets' scan_file does, batch_size lines at a time.
+
+        When the plain lines hold no secrets, the eager transformers (e.g.
+        config-file parsing) get a second pass. A secret repeated on several
+        lines is reported once, at its first line, as SecretsCollection does.
+        """
+        seen: Set[PotentialSecret] = set()
+        for use_eager_transformers in (False, True):
+            with open_source() as f:
+                lines = get_transformed_file(f, use_eager_transformers=use_eager_transformers)
+                if not lines and not use_eager_transformers:
+                    lines = f.readlines()
+            lines = lines or []
+            for start in range(0, len(lines), batch_size):
+                batch = []
+                for secret in self._scan_lines(filename, lines, start, start + batch_size):
+                    if secret not in seen:
+                        seen.add(secret)
+                        batch.append(secret)
+                yield batch
+            if seen:
+                break
+
+    @staticmethod
+    def _secret_results(
+        secrets: List[PotentialSecret], line_to_var: Dict[int, str]
+    ) -> List[Dict[str, Any]]:
+        """Turn detected secrets into results attributed to variables."""
+        results = []
+        for secret in secrets:
+            line_num = secret.line_number
+            var_name = line_to_var.get(line_num, "")
+            where = var_name or "environment file"
             results.append(
                 {
-                    "rule_id": "secrets-scan-error",
-                    "level": "warning",
-                    "message": f"Secrets scanning encountered an error: {str(e)}",
-                    "location": {"line": 1},
+                    "rule_id": "secret-detected",
+                    "level": "error",
+                    "message": f"Potential {secret.type} detected in {where}",
+                    "location": {
+                        "line": line_num,
+                    },
+                    "details": {
+                        "secret_type": secret.type,
+                        "variable": var_name,
+                    },
                 }
             )
-
         return results
 
     def scan_env_content(self, env_content: str) -> List[Dict[str, Any]]:
@@ -88,20 +243,12 @@ class SecretsScanner:
         results = []
 
         try:
-            # Write content to temporary file for scanning
-            with tempfile.NamedTemporaryFile(
-                mode="w", suffix=".env", delete=False
-            ) as tmp_file:
-                tmp_file.write(env_content)
-                tmp_path = Path(tmp_file.name)
-
-            # Scan temporary file
-            secrets = SecretsCollection()
-            secrets.scan_file(str(tmp_path))
-
-            # Process detected secrets
-            for filename, file_secrets in secrets.data.items():
-                for secret in file_secrets:
+            # Scan the in-memory content directly, no temporary file needed
+            # The content is already in memory, so it is scanned as one batch
+            for secrets in self._scan_source(
+                _MemoryFile.name, lambda: _MemoryFile(env_content), sys.maxsize
+            ):
+                for secret in secrets:
                     results.append(
                         {
                             "rule_id": "secret-detected",
@@ -116,9 +263,6 @@ class SecretsScanner:
                         }
                     )
 
-            # Clean up temporary file
-            tmp_path.unlink()
-
         except Exception as e:
             results.append(
                 {
@@ -131,9 +275,75 @@ class SecretsScanner:
 
         return results
 
+    def _scan_lines(
+        self, filename: str, lines: List[str], start: int, stop: int
+    ) -> Iterator[PotentialSecret]:
+        """
+        Scan lines[start:stop] the way detect-secrets scans a file.
+
+        Each line goes through detect-secrets' line filters (such as
+        "pragma: allowlist secret") before the plugins run, and each finding
+        through its secret filters. The code snippet context is taken from
+        the full list of lines.
+        """
+        for index in range(start, min(stop, len(lines))):
+            line_num = index + 1
+            line = lines[index].rstrip()
+            context = get_code_snippet(lines=lines, line_number=line_num)
+            if _is_filtered_out(
+                required_filter_parameters=["line"],
+                filename=filename,
+                line=line,
+                context=context,
+            ):
+                continue
+
+            for plugin in self._plugins_for_line(line):
+                for secret in _scan_line(
+                    plugin=plugin,
+                    filename=filename,
+                    line=line,
+                    line_number=line_num,
+                    context=context,
+                ):
+                    if not _is_filtered_out(
+                        required_filter_parameters=["context"],
+                        filename=secret.filename,
+                        secret=secret.secret_value,
+                        plugin=plugin,
+                        line=line,
+                        context=context,
+                    ):
+                        yield secret
+
+    def _plugins_for_line(self, line: str) -> Tuple[BasePlugin, ...]:
+        """Pick the plugins to run on a line, skipping regex plugins that cannot match."""
+        # Hyperscan's character classes and case folding are ASCII-only, so
+        # only printable ASCII lines are prefiltered
+        if self._prefilter is not None and line.isascii() and line.isprintable():
+            try:
+                self._prefilter.scan(
+                    line.encode("ascii"),
+                    match_event_handler=_stop_scan,
+                    scratch=self._thread_scratch(),
+                )
+            except hyperscan.ScanTerminated:
+                return self._plugins
+            return self._unfiltered_plugins
+        return self._plugins
+
+    def _thread_scratch(self) -> Any:
+        """Return this thread's Hyperscan scratch space for the prefilter."""
+        scratch = getattr(self._scratch, "value", None)
+        if scratch is None:
+            scratch = self._scratch.value = hyperscan.Scratch(self._prefilter)
+        return scratch
+
+    @staticmethod
+    def _line_index(env_vars: Dict[str, Any]) -> Dict[int, str]:
+        """Map each line number to the environment variable defined on it."""
+        return {data["line"]: name for name, data in env_vars.items() if "line" in data}
+
     def _find_var_at_line(self, env_vars: Dict[str, Any], line_num: int) -> str:
         """Find environment variable name at given line number."""
-        for var_name, var_data in env_vars.items():
-            if var_data.get("line") == line_num:
-                return var_name
-        return ""
+        return self._line_index(env_vars).get(line_num, "")
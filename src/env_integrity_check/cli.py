@@ -13,10 +13,22 @@ import time
 from pathlib import Path
 from .schema_introspect import validate_env
 from .secrets_scanner import secrets_scan as run_secrets_scan
-from .sarif_reporter import emit_sarif
+from .sarif_reporter import emit_sarif_bytes
 from .policy_loader import load_policy
 from .metrics import emit_metrics
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "speedups" extra
+    orjson = None
+
+
+def _dump_json(doc: dict) -> bytes:
+    """Serialize a report document as indented UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(doc, option=orjson.OPT_INDENT_2)
+    return json.dumps(doc, indent=2, ensure_ascii=False).encode("utf-8")
+
 
 @click.group()
 def cli():
@@ -49,11 +61,10 @@ def audit(example, schema, report, out, fail_on, secrets_scan):
         findings["secrets"] = secrets
 
     if report == "sarif":
-        sarif_doc = emit_sarif(findings, file_path, policy)
-        Path(out).write_text(json.dumps(sarif_doc, indent=2))
+        Path(out).write_bytes(emit_sarif_bytes(findings, file_path, policy))
         click.echo(f"SARIF report written to {out}")
     else:
-        Path(out).write_text(json.dumps(findings, indent=2))
+        Path(out).write_bytes(_dump_json(findings))
         click.echo(f"JSON report written to {out}")
 
     duration_ms = (time.time() - start_time) * 1000
@@ -1,15 +1,23 @@
 import os
 from pathlib import Path
 
+# Read once at import; the environment is not expected to change mid-run
+_ENABLED = bool(os.getenv("ENV_INTEGRITY_METRICS_ENABLED"))
+_METRICS_FILE = Path(os.getenv("ENV_INTEGRITY_METRICS_FILE", "/tmp/env_integrity.prom"))
+
 def emit_metrics(findings: dict, policy: dict, duration_ms: float):
     """Emit Prometheus text metrics if enabled."""
-    if not os.getenv("ENV_INTEGRITY_METRICS_ENABLED"):
+    if not _ENABLED:
         return
 
+    level_by_section = {
+        section: policy.get(section, {}).get("level", "note") for section in findings
+    }
     lines = [f"env_integrity_scan_duration_ms {duration_ms:.2f}"]
-    for section, items in findings.items():
-        level = policy.get(section, {}).get("level", "note")
-        lines.append(f'env_integrity_findings{{section="{section}",level="{level}"}} {len(items)}')
+    lines.extend(
+        f'env_integrity_findings{{section="{section}",level="{level_by_section[section]}"}} '
+        f"{len(items)}"
+        for section, items in findings.items()
+    )
 
-    metrics_file = Path(os.getenv("ENV_INTEGRITY_METRICS_FILE", "/tmp/env_integrity.prom"))
-    metrics_file.write_text("\n".join(lines) + "\n")
+    _METRICS_FILE.write_bytes(("\n".join(lines) + "\n").encode("utf-8"))
@@ -1,14 +1,28 @@
 import json
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "speedups" extra
+    orjson = None
+
+_DEFAULT = {
+    "errors": {"level": "error"},
+    "warnings": {"level": "warning"},
+    "secrets": {"level": "error"},
+}
+
+@lru_cache(maxsize=8)
+def _load(path_str: str, mtime_ns: int) -> dict:
+    path = Path(path_str)
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text())
+
 def load_policy() -> dict:
     """Load built-in or custom policy definition."""
-    default = {
-        "errors": {"level": "error"},
-        "warnings": {"level": "warning"},
-        "secrets": {"level": "error"},
-    }
     path = Path("policy.json")
     if path.exists():
-        return json.loads(path.read_text())
-    return default
+        return _load(str(path), path.stat().st_mtime_ns)
+    return _DEFAULT
@@ -1,3 +1,5 @@
+import re
+from functools import lru_cache
 from pathlib import Path
 
 SENSITIVE_KEYS = frozenset([
@@ -5,9 +7,10 @@ SENSITIVE_KEYS = frozenset([
     "auth", "credential", "private", "cert", "certificate"
 ])
 
+_SENSITIVE_RE = re.compile("|".join(map(re.escape, sorted(SENSITIVE_KEYS))), re.IGNORECASE)
+
 def is_sensitive_key(key: str) -> bool:
-    k = key.lower()
-    return any(s in k for s in SENSITIVE_KEYS)
+    return _SENSITIVE_RE.search(key) is not None
 
 def _sanitize_snippet(value: str, rule_id: str) -> str:
     if rule_id == "SEC001":
@@ -16,6 +19,7 @@ def _sanitize_snippet(value: str, rule_id: str) -> str:
         return value[:100] + "..."
     return value
 
+@lru_cache(maxsize=512)
 def sanitize_for_sarif(key: str, value: str, rule_id: str) -> str:
     if is_sensitive_key(key):
         return "[REDACTED]"
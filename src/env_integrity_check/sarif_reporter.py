@@ -1,30 +1,43 @@
 import json
+from operator import itemgetter
 from pathlib import Path
 from .sanitizer import sanitize_for_sarif
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "speedups" extra
+    orjson = None
+
 SARIF_SCHEMA_URI = "https://json.schemastore.org/sarif-2.1.0.json"
 
+def _sort_key(item: dict, uri: str) -> tuple:
+    return (item.get("type", "ENV"), uri, item.get("line", 1), item["message"])
+
+def _to_result(level: str, item: dict, uri: str) -> dict:
+    snippet = sanitize_for_sarif(item.get("key", ""), item.get("message", ""), "ENV003")
+    return {
+        "ruleId": item.get("type", "ENV"),
+        "level": level,
+        "message": {"text": item["message"]},
+        "locations": [{
+            "physicalLocation": {
+                "artifactLocation": {"uri": uri, "uriBaseId": "%SRCROOT%"},
+                "region": {"startLine": item.get("line", 1),
+                           "snippet": {"text": snippet}}
+            }
+        }]
+    }
+
 def emit_sarif(findings: dict, file_path: Path, policy: dict) -> dict:
     """Produce deterministic SARIF report."""
-    results = []
-    for level, items in findings.items():
-        for item in items:
-            results.append({
-                "ruleId": item.get("type", "ENV"),
-                "level": level,
-                "message": {"text": item["message"]},
-                "locations": [{
-                    "physicalLocation": {
-                        "artifactLocation": {"uri": str(file_path), "uriBaseId": "%SRCROOT%"},
-                        "region": {"startLine": item.get("line", 1),
-                                   "snippet": {"text": sanitize_for_sarif(item.get("key", ""), item.get("message", ""), "ENV003")}}
-                    }
-                }]
-            })
-
-    results.sort(key=lambda r: (r["ruleId"], r["locations"][0]["physicalLocation"]["artifactLocation"]["uri"],
-                                r["locations"][0]["physicalLocation"]["region"]["startLine"],
-                                r["message"]["text"]))
+    uri = str(file_path)
+    keyed = [
+        (_sort_key(item, uri), _to_result(level, item, uri))
+        for level, items in findings.items()
+        for item in items
+    ]
+    keyed.sort(key=itemgetter(0))
+    results = [result for _, result in keyed]
 
     run = {
         "tool": {"driver": {"name": "env-integrity-check"}},
@@ -32,3 +45,14 @@ def emit_sarif(findings: dict, file_path: Path, policy: dict) -> dict:
     }
 
     return {"version": "2.1.0", "$schema": SARIF_SCHEMA_URI, "runs": [run]}
+
+def emit_sarif_bytes(findings: dict, file_path: Path, policy: dict) -> bytes:
+    """Produce deterministic SARIF report as indented JSON with sorted keys."""
+    sarif_doc = emit_sarif(findings, file_path, policy)
+    if orjson is not None:
+        return orjson.dumps(
+            sarif_doc,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE,
+        )
+    text = json.dumps(sarif_doc, indent=2, sort_keys=True, ensure_ascii=False)
+    return (text + "\n").encode("utf-8")
@@ -1,3 +1,6 @@
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
 from importlib import import_module
 from pathlib import Path
 from typing import Type
@@ -5,44 +8,77 @@ from pydantic import BaseModel, ValidationError
 import json
 from .policy_loader import load_policy
 
+_PLACEHOLDERS = frozenset(("TODO", "CHANGEME", "XXX", ""))
+
 def load_model(schema_path: str) -> Type[BaseModel]:
+    return _cached_load_model(schema_path)
+
+@lru_cache(maxsize=None)
+def _cached_load_model(schema_path: str) -> Type[BaseModel]:
     module_name, class_name = schema_path.split(":")
-    mod = import_module(module_name)
+    mod = sys.modules.get(module_name)
+    if mod is None:
+        mod = import_module(module_name)
     return getattr(mod, class_name)
 
-def parse_env(file_path: Path) -> dict:
-    env = {}
-    for line in file_path.read_text().splitlines():
-        if line.strip() and not line.startswith("#"):
+@dataclass
+class ParsedEnv:
+    """Parsed .env contents, stored as parallel name->value and name->line dicts."""
+    __slots__ = ("values", "lines")
+    values: dict
+    lines: dict
+
+def parse_env(file_path: Path) -> ParsedEnv:
+    values = {}
+    lines = {}
+    with file_path.open("r", encoding="utf-8") as f:
+        for line_num, raw in enumerate(f, 1):
+            line = raw.strip()
+            if not line or line[0] == "#":
+                continue
             key, _, value = line.partition("=")
-            env[key.strip()] = value.strip()
-    return env
+            key = key.rstrip()
+            values[key] = value.lstrip()
+            lines[key] = line_num
+    return ParsedEnv(values, lines)
 
 def validate_env(file_path: Path, schema_path: str) -> tuple[dict, dict]:
     """Validate environment file against Pydantic schema."""
+    stat = file_path.stat()
+    findings = _validate_env_cached(str(file_path), stat.st_mtime_ns, stat.st_size, schema_path)
+    # Callers extend the findings, so hand out fresh section lists
+    findings = {section: list(items) for section, items in findings.items()}
+
+    # Load default policy
+    policy = load_policy()
+    return findings, policy
+
+@lru_cache(maxsize=64)
+def _validate_env_cached(path_str: str, mtime_ns: int, size: int, schema_path: str) -> dict:
     model = load_model(schema_path)
-    env = parse_env(file_path)
+    parsed = parse_env(Path(path_str))
     findings = {"errors": [], "warnings": []}
 
     try:
-        model(**env)
+        # Validate against the compiled core schema directly
+        model.__pydantic_validator__.validate_python(parsed.values)
     except ValidationError as e:
         for err in e.errors():
-            loc = ".".join(str(l) for l in err["loc"])
+            loc = ".".join(map(str, err["loc"])) if err["loc"] else "unknown"
             findings["errors"].append({
                 "key": loc,
                 "message": err["msg"],
                 "type": err["type"],
+                "line": parsed.lines.get(err["loc"][0], 1) if err["loc"] else 1,
             })
 
     # Placeholder detection (simple baseline)
-    for key, val in env.items():
-        if val.strip().upper() in ("TODO", "CHANGEME", "XXX", ""):
+    for key, val in parsed.values.items():
+        if val.strip().upper() in _PLACEHOLDERS:
             findings["warnings"].append({
                 "key": key,
                 "message": "Contains placeholder or empty value.",
+                "line": parsed.lines[key],
             })
 
-    # Load default policy
-    policy = load_policy()
-    return findings, policy
+    return findings
@@ -0,0 +1,90 @@
+"""
+Shared fixtures for env-integrity-check tests.
+"""
+
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+from env_integrity_check.schema_introspect import SchemaIntrospector
+
+# The legacy src/ layout shares the packaged layout's import name, so tests
+# import it under this name instead
+SRC_PACKAGE = "src_env_integrity_check"
+SRC_DIR = Path(__file__).resolve().parent.parent / "src" / "env_integrity_check"
+
+# Schema sources used across the schema introspection tests, by name
+SCHEMAS = {
+    "app_debug": """
+from pydantic import BaseModel
+
+class AppConfig(BaseModel):
+    app_name: str
+    debug: bool = False
+""",
+    "app_port": """
+from pydantic import BaseModel
+
+class AppConfig(BaseModel):
+    app_name: str
+    port: int
+""",
+    "app_db": """
+from pydantic import BaseModel
+
+class AppConfig(BaseModel):
+    app_name: str
+    database_url: str
+""",
+    "app_port_default": """
+from pydantic import BaseModel
+
+class AppConfig(BaseModel):
+    app_name: str
+    port: int = 8000
+""",
+}
+
+
+@pytest.fixture(scope="session")
+def schema_introspector(tmp_path_factory):
+    """
+    Factory returning a shared SchemaIntrospector for a named schema.
+
+    Each schema in SCHEMAS is written and imported once per test session.
+    """
+    introspectors = {}
+
+    def get(name: str) -> SchemaIntrospector:
+        if name not in introspectors:
+            schema_file = tmp_path_factory.mktemp("schemas") / f"{name}.py"
+            schema_file.write_text(SCHEMAS[name])
+            introspectors[name] = SchemaIntrospector(schema_file)
+        return introspectors[name]
+
+    return get
+
+
+@pytest.fixture(scope="session")
+def src_module():
+    """
+    Factory importing a module of the src/ layout package by name.
+
+    The package is loaded once under SRC_PACKAGE, so its relative imports
+    resolve within src/ rather than the packaged layout.
+    """
+    if SRC_PACKAGE not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            SRC_PACKAGE, SRC_DIR / "__init__.py", submodule_search_locations=[str(SRC_DIR)]
+        )
+        package = importlib.util.module_from_spec(spec)
+        sys.modules[SRC_PACKAGE] = package
+        spec.loader.exec_module(package)
+
+    def get(name: str):
+        return importlib.import_module(f"{SRC_PACKAGE}.{name}")
+
+    return get
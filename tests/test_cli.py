@@ -2,10 +2,13 @@
 Tests for CLI module.
 """
 
+import json
+
 import pytest
 from click.testing import CliRunner
 
 from env_integrity_check.cli import main, parse_env_file, validate_policy
+from env_integrity_check.sarif_reporter import SARIFReporter
 
 
 def test_parse_env_file_basic():
@@ -43,6 +46,28 @@ def test_parse_env_file_empty_lines():
     assert result["VAR2"]["value"] == "value2"
 
 
+def test_parse_env_file_line_numbers():
+    """Test line numbers and skipped lines."""
+    content = "# APP_NAME=commented\n\n  APP_NAME = myapp  \nNO_EQUALS\nPORT=8000 # inline\n"
+    result = parse_env_file(content)
+
+    assert len(result) == 2
+    assert result["APP_NAME"] == {"value": "myapp", "line": 3}
+    assert result["PORT"] == {"value": "8000 # inline", "line": 5}
+
+
+def test_parse_env_file_from_file(tmp_path):
+    """Test parsing lines read from an open file."""
+    env_file = tmp_path / ".env"
+    env_file.write_text("# Comment\nAPP_NAME=myapp\n\nSECRET_KEY='value'\n")
+
+    with env_file.open() as fh:
+        result = parse_env_file(fh)
+
+    assert result["APP_NAME"] == {"value": "myapp", "line": 2}
+    assert result["SECRET_KEY"] == {"value": "value", "line": 4}
+
+
 def test_validate_policy_required():
     """Test policy validation for required variables."""
     env_vars = {
@@ -97,6 +122,27 @@ def test_validate_policy_pattern():
     assert results[0]["level"] == "warning"
 
 
+def test_validate_policy_multiple_patterns():
+    """Test that every matching pattern is reported."""
+    env_vars = {
+        "APP_NAME": {"value": "test", "line": 1},
+        "TEST_PROD_URL": {"value": "test", "line": 2},
+    }
+    policy = {
+        "patterns": [
+            {"regex": ".*_PROD_.*", "action": "warn", "message": "Production variable"},
+            {"regex": "^TEST_.*", "action": "warn"},
+        ],
+    }
+
+    results = validate_policy(env_vars, policy)
+
+    assert len(results) == 2
+    assert results[0]["message"] == "Production variable"
+    assert "TEST_PROD_URL" in results[1]["message"]
+    assert all(r["location"]["line"] == 2 for r in results)
+
+
 def test_cli_help():
     """Test CLI help output."""
     runner = CliRunner()
@@ -104,3 +150,54 @@ def test_cli_help():
 
     assert result.exit_code == 0
     assert "env-integrity-check" in result.output or "Validate .env files" in result.output
+
+
+def test_cli_failed_report_writes_nothing(tmp_path, monkeypatch):
+    """Test that an error while building the report leaves no partial output."""
+    env_file = tmp_path / ".env"
+    env_file.write_text("APP_NAME=myapp\nDEBUG=true\n")
+    policy_file = tmp_path / "policy.yaml"
+    policy_file.write_text("required:\n  - DATABASE_URL\n  - SECRET_KEY\n")
+    output = tmp_path / "report.sarif"
+
+    calls = []
+
+    def fail_second(self, finding, *args):
+        calls.append(finding)
+        if len(calls) > 1:
+            raise RuntimeError("boom")
+        return {"ruleId": finding.rule_id}
+
+    monkeypatch.setattr(SARIFReporter, "_convert_to_sarif_result", fail_second)
+    runner = CliRunner()
+
+    args = [str(env_file), "--policy", str(policy_file), "--no-detect-secrets"]
+
+    result = runner.invoke(main, args + ["-o", str(output)])
+    assert result.exit_code == 2
+    assert not output.exists()
+
+    calls.clear()
+    result = runner.invoke(main, args)
+    assert result.exit_code == 2
+    assert "{" not in result.stdout
+
+
+def test_cli_report_is_utf8(tmp_path):
+    """Test that non-ASCII values are written to stdout as UTF-8."""
+    env_file = tmp_path / ".env"
+    env_file.write_text("APP_NAME=myapp\n")
+    policy_file = tmp_path / "policy.yaml"
+    policy_file.write_text(
+        'patterns:\n  - regex: "^APP_"\n    action: warn\n    message: Nom réservé\n',
+        encoding="utf-8",
+    )
+    runner = CliRunner(charset="ascii")
+
+    args = [str(env_file), "--policy", str(policy_file), "--no-detect-secrets"]
+
+    result = runner.invoke(main, args)
+
+    assert result.exit_code == 1
+    report = json.loads(result.stdout_bytes.decode("utf-8"))
+    assert report["runs"][0]["results"][0]["message"]["text"] == "Nom réservé"
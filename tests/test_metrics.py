@@ -24,12 +24,14 @@ def test_metrics_recording():
     """Test recording metrics."""
     metrics = Metrics()
 
-    metrics.record_file_size(1024)
-    metrics.record_env_var_count(10)
-    metrics.record_schema_violations(2)
-    metrics.record_secrets_found(1)
-    metrics.record_policy_violations(3)
-    metrics.record_policy_loaded()
+    metrics.update(
+        file_size_bytes=1024,
+        env_var_count=10,
+        schema_violations=2,
+        secrets_found=1,
+        policy_violations=3,
+        policy_loaded=True,
+    )
 
     assert metrics.metrics["file_size_bytes"] == 1024
     assert metrics.metrics["env_var_count"] == 10
@@ -39,13 +41,19 @@ def test_metrics_recording():
     assert metrics.metrics["policy_loaded"] is True
 
 
+def test_metrics_update_unknown():
+    """Test updating an unknown metric."""
+    metrics = Metrics()
+
+    with pytest.raises(ValueError, match="Unknown metrics: bogus"):
+        metrics.update(bogus=1)
+
+
 def test_metrics_total_violations():
     """Test total violations calculation."""
     metrics = Metrics()
 
-    metrics.record_schema_violations(2)
-    metrics.record_secrets_found(1)
-    metrics.record_policy_violations(3)
+    metrics.update(schema_violations=2, secrets_found=1, policy_violations=3)
 
     assert metrics.get_total_violations() == 6
 
@@ -53,8 +61,7 @@ def test_metrics_total_violations():
 def test_metrics_to_dict():
     """Test metrics export to dictionary."""
     metrics = Metrics()
-    metrics.record_file_size(512)
-    metrics.record_env_var_count(5)
+    metrics.update(file_size_bytes=512, env_var_count=5)
 
     data = metrics.to_dict()
 
@@ -66,8 +73,7 @@ def test_metrics_to_dict():
 def test_metrics_str():
     """Test metrics string representation."""
     metrics = Metrics()
-    metrics.record_file_size(256)
-    metrics.record_env_var_count(3)
+    metrics.update(file_size_bytes=256, env_var_count=3)
 
     output = str(metrics)
 
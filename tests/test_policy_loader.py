@@ -5,7 +5,7 @@ Tests for policy loader module.
 import pytest
 from pathlib import Path
 
-from env_integrity_check.policy_loader import PolicyLoader
+from env_integrity_check.policy_loader import PolicyLoader, compile_pattern_rules
 
 
 def test_policy_loader_valid_policy(tmp_path):
@@ -120,6 +120,22 @@ patterns:
         loader.load()
 
 
+def test_compile_pattern_rules_inline_flags():
+    """Test that rules with inline flags are not fused into one union."""
+    patterns = [
+        {"regex": "^APP NAME$", "action": "warn"},
+        {"regex": "(?x) ^ DEBUG $", "action": "warn"},
+    ]
+
+    union, rules = compile_pattern_rules(patterns)
+
+    assert union is None
+    assert [bool(pattern.match("APP NAME")) for pattern, _ in rules] == [True, False]
+
+    union, _ = compile_pattern_rules(patterns[:1])
+    assert union is not None and union.match("APP NAME")
+
+
 def test_create_example_policy(tmp_path):
     """Test creating example policy."""
     policy_file = tmp_path / "example.yaml"
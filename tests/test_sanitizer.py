@@ -2,8 +2,11 @@
 Tests for sanitizer module.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
+from env_integrity_check import sanitizer as sanitizer_module
 from env_integrity_check.sanitizer import Sanitizer
 
 
@@ -21,6 +24,20 @@ def test_sanitizer_basic():
     assert "secret123" not in sanitized["message"]
 
 
+def test_sanitizer_inplace():
+    """Test in-place sanitization mutates the given result."""
+    sanitizer = Sanitizer()
+    result = {
+        "message": "PASSWORD=hunter2",
+        "details": {"password": "hunter2", "field": "PASSWORD"},
+    }
+
+    assert sanitizer.sanitize_result_inplace(result) is None
+    assert "hunter2" not in result["message"]
+    assert result["details"]["password"] == "***REDACTED***"
+    assert result["details"]["field"] == "PASSWORD"
+
+
 def test_sanitizer_sensitive_keys():
     """Test sanitization of sensitive keys."""
     sanitizer = Sanitizer()
@@ -57,6 +74,21 @@ def test_sanitizer_nested_dict():
     assert sanitized["details"]["config"]["app_name"] == "myapp"
 
 
+def test_sanitizer_deeply_nested_details():
+    """Test that deeply nested details are sanitized without recursion limits."""
+    sanitizer = Sanitizer()
+    details = {"api_key": "secret123"}
+    for _ in range(2000):
+        details = {"child": [details]}
+
+    sanitized = sanitizer.sanitize_result({"message": "x", "details": details})
+
+    node = sanitized["details"]
+    for _ in range(2000):
+        node = node["child"][0]
+    assert node == {"api_key": "***REDACTED***"}
+
+
 def test_sanitizer_env_vars():
     """Test sanitization of environment variables."""
     sanitizer = Sanitizer()
@@ -84,6 +116,40 @@ def test_is_sensitive_key():
     assert not sanitizer._is_sensitive_key("app_name")
 
 
+def test_is_sensitive_key_cache(monkeypatch):
+    """Test key verdicts are remembered and the cache stays bounded."""
+    monkeypatch.setattr(Sanitizer, "_KEY_CACHE_SIZE", 2)
+    sanitizer = Sanitizer()
+
+    assert sanitizer._is_sensitive_key("API_KEY")
+    assert not sanitizer._is_sensitive_key("username")
+    assert sanitizer._key_cache == {"API_KEY": True, "username": False}
+
+    assert not sanitizer._is_sensitive_key("app_name")
+    assert sanitizer._key_cache == {"app_name": False}
+
+
+def test_is_sensitive_key_regex_fallback(monkeypatch):
+    """Test sensitive key detection without pyahocorasick."""
+    monkeypatch.setattr(sanitizer_module, "ahocorasick", None)
+    sanitizer = Sanitizer()
+
+    assert sanitizer._key_automaton is None
+    assert sanitizer._is_sensitive_key("DB_PASSWORD")
+    assert sanitizer._is_sensitive_key("ApiKey")
+    assert not sanitizer._is_sensitive_key("username")
+
+
+def test_sanitizer_without_hyperscan(monkeypatch):
+    """Test text sanitization falls back to the regex keyword check."""
+    monkeypatch.setattr(sanitizer_module, "hyperscan", None)
+    sanitizer = Sanitizer()
+
+    assert sanitizer._keyword_db is None
+    assert sanitizer._sanitize_text("API_KEY=secret123") == "API_KEY=***REDACTED***"
+    assert sanitizer._sanitize_text("nothing to hide") == "nothing to hide"
+
+
 def test_sanitizer_custom_redaction():
     """Test custom redaction text."""
     sanitizer = Sanitizer(redaction_text="[HIDDEN]")
@@ -94,3 +160,44 @@ def test_sanitizer_custom_redaction():
     sanitized = sanitizer.sanitize_result(result)
 
     assert sanitized["details"]["password"] == "[HIDDEN]"
+
+
+def test_sanitizer_preserve_length():
+    """Test length-preserving redaction overwrites values in place."""
+    sanitizer = Sanitizer(redaction_text="*", preserve_length=True)
+    message = 'Set API_KEY="secret123" and {"password": "hunter2"}'
+    result = {
+        "message": message,
+        "details": {"token": "abcdef", "nested": {"auth": "xy"}},
+    }
+
+    sanitized = sanitizer.sanitize_result(result)
+
+    assert sanitized["message"] == 'Set API_KEY="*********" and {"password": "*******"}'
+    assert len(sanitized["message"]) == len(message)
+    assert sanitized["details"] == {"token": "******", "nested": {"auth": "**"}}
+
+
+def test_sanitizer_preserve_length_truncates_token():
+    """Test the redaction text is repeated and truncated to the value length."""
+    sanitizer = Sanitizer(redaction_text="[HIDDEN]", preserve_length=True)
+
+    assert sanitizer._sanitize_text("SECRET=abc") == "SECRET=[HI"
+    assert sanitizer.sanitize_env_vars({"TOKEN": "0123456789"}) == {"TOKEN": "[HIDDEN][H"}
+
+    with pytest.raises(ValueError):
+        Sanitizer(redaction_text="", preserve_length=True)
+
+
+def test_sanitizer_shared_across_threads():
+    """Test that one sanitizer can sanitize text from several threads at once."""
+    sanitizer = Sanitizer()
+    text = "x" * 20000 + " API_KEY=secret123 " + "y" * 20000
+
+    def sanitize(_):
+        return [sanitizer._sanitize_text(text) for _ in range(50)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        outputs = [out for batch in pool.map(sanitize, range(8)) for out in batch]
+
+    assert all("API_KEY=***REDACTED***" in out for out in outputs)
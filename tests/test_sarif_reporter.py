@@ -2,9 +2,13 @@
 Tests for SARIF reporter module.
 """
 
+import io
+import json
+
 import pytest
 
-from env_integrity_check.sarif_reporter import SARIFReporter
+from env_integrity_check import sarif_reporter as sarif_reporter_module
+from env_integrity_check.sarif_reporter import SARIFReporter, result_sort_key
 
 
 def test_sarif_reporter_initialization():
@@ -100,6 +104,63 @@ def test_sarif_report_with_metrics():
     assert report["runs"][0]["properties"]["metrics"]["file_size_bytes"] == 1024
 
 
+def test_stream_report_matches_generate_report():
+    """Test streamed report has the same content as the in-memory report."""
+    reporter = SARIFReporter("test-tool", "1.0.0")
+    results = [
+        {
+            "rule_id": "secret-detected",
+            "level": "error",
+            "message": "Error 2",
+            "location": {"line": 2},
+            "details": {"variable": "API_KEY"},
+        },
+        {
+            "rule_id": "schema-validation",
+            "level": "error",
+            "message": "Error 1",
+            "location": {"line": 1},
+        },
+    ]
+    metrics = {"file_size_bytes": 1024}
+
+    fh = io.StringIO()
+    count = reporter.stream_report(
+        sorted(results, key=result_sort_key), "test.env", fh, metrics_data=metrics
+    )
+
+    assert count == 2
+    assert json.loads(fh.getvalue()) == reporter.generate_report(
+        results, "test.env", metrics_data=metrics
+    )
+
+
+def test_stream_report_output_without_orjson(monkeypatch):
+    """Test the stdlib fallback writes the same bytes as orjson."""
+    reporter = SARIFReporter("test-tool", "1.0.0")
+    results = [
+        {
+            "rule_id": "schema-validation",
+            "level": "error",
+            "message": "naïve value ☃",
+            "location": {"line": 1},
+            "details": {"input": "café", "codes": {404: "missing"}},
+        },
+    ]
+
+    fh = io.StringIO()
+    reporter.stream_report(results, "test.env", fh)
+    monkeypatch.setattr(sarif_reporter_module, "orjson", None)
+    fallback = io.StringIO()
+    reporter.stream_report(results, "test.env", fallback)
+
+    assert fallback.getvalue() == fh.getvalue()
+    assert "naïve value ☃" in fallback.getvalue()
+    assert json.loads(fallback.getvalue())["runs"][0]["results"][0]["properties"]["codes"] == {
+        "404": "missing"
+    }
+
+
 def test_level_mapping():
     """Test level mapping."""
     reporter = SARIFReporter("test-tool", "1.0.0")
@@ -119,6 +180,57 @@ def test_fingerprint_deterministic():
     fp2 = reporter._generate_fingerprint("test-rule", "test.env", {"line": 5})
 
     assert fp1 == fp2
+    assert len(fp1) == 32
 
     fp3 = reporter._generate_fingerprint("test-rule", "test.env", {"line": 6})
     assert fp1 != fp3
+
+
+def test_fingerprint_prefix_cache():
+    """Test cached prefix hashers give the same fingerprints."""
+    reporter = SARIFReporter("test-tool", "1.0.0")
+    prefix_hashers = {}
+
+    for line in (1, 5, 1):
+        location = {"line": line}
+        assert reporter._generate_fingerprint(
+            "test-rule", "test.env", location, prefix_hashers
+        ) == reporter._generate_fingerprint("test-rule", "test.env", location)
+
+    assert list(prefix_hashers) == ["test-rule"]
+
+
+def test_sarif_report_pre_sorted():
+    """Test pre-sorted results keep their order."""
+    reporter = SARIFReporter("test-tool", "1.0.0")
+    results = [
+        {"rule_id": "b-rule", "message": "First", "location": {"line": 1}},
+        {"rule_id": "a-rule", "message": "Second", "location": {"line": 1}},
+    ]
+
+    report = reporter.generate_report(results, "test.env", pre_sorted=True)
+
+    assert [r["ruleId"] for r in report["runs"][0]["results"]] == ["b-rule", "a-rule"]
+
+
+def test_sarif_report_rules_not_shared():
+    """Test that mutating one report's rules does not leak into later reports."""
+    reporter = SARIFReporter("test-tool", "1.0.0")
+    results = [
+        {"rule_id": "schema-validation", "level": "error", "message": "Error"},
+        {"rule_id": "custom-rule", "level": "warning", "message": "Custom"},
+    ]
+
+    first = reporter.generate_report(results, "test.env")
+    for rule in first["runs"][0]["tool"]["driver"]["rules"]:
+        rule["shortDescription"]["text"] = "changed"
+        rule["help"]["text"] = "changed"
+
+    second = reporter.generate_report(results, "test.env")
+
+    rules = second["runs"][0]["tool"]["driver"]["rules"]
+    assert [rule["shortDescription"]["text"] for rule in rules] == [
+        "Rule custom-rule",
+        "Schema validation error",
+    ]
+    assert SARIFReporter._RULE_METADATA["schema-validation"]["help"]["text"] != "changed"
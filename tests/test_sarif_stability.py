@@ -1,8 +1,9 @@
 import json
 from pathlib import Path
-from env_integrity_check.sarif_reporter import emit_sarif
 
-def test_deterministic_output(tmp_path):
+
+def test_deterministic_output(src_module):
+    emit_sarif = src_module("sarif_reporter").emit_sarif
     findings = {
         "warnings": [{"key": "DATABASE_URL", "message": "Contains placeholder", "line": 1}],
         "errors": []
@@ -10,3 +11,25 @@ def test_deterministic_output(tmp_path):
     sarif1 = emit_sarif(findings, Path(".env.example"), {})
     sarif2 = emit_sarif(findings, Path(".env.example"), {})
     assert json.dumps(sarif1, sort_keys=True) == json.dumps(sarif2, sort_keys=True)
+
+
+def test_emit_sarif_bytes_stable(src_module, monkeypatch):
+    sarif_reporter = src_module("sarif_reporter")
+    findings = {
+        "warnings": [
+            {"key": "APP_NAME", "message": "Nom réservé", "line": 2},
+            {"key": "DATABASE_URL", "message": "Contains placeholder", "line": 1},
+        ],
+        "errors": [{"key": "PORT", "message": "Not an integer", "line": 3}],
+    }
+
+    report = sarif_reporter.emit_sarif_bytes(findings, Path(".env.example"), {})
+
+    assert report == sarif_reporter.emit_sarif_bytes(findings, Path(".env.example"), {})
+    expected = json.dumps(json.loads(report), indent=2, sort_keys=True, ensure_ascii=False)
+    assert report == (expected + "\n").encode("utf-8")
+    assert "Nom réservé".encode("utf-8") in report
+
+    # The stdlib fallback writes the same bytes as orjson
+    monkeypatch.setattr(sarif_reporter, "orjson", None)
+    assert sarif_reporter.emit_sarif_bytes(findings, Path(".env.example"), {}) == report
@@ -2,46 +2,27 @@
 Tests for schema introspection module.
 """
 
+import gc
+import weakref
+
 import pytest
 from pathlib import Path
-from pydantic import BaseModel
+from pydantic import BaseModel, create_model
 
-from env_integrity_check.schema_introspect import SchemaIntrospector
+from env_integrity_check.schema_introspect import SchemaIntrospector, _model_snapshot
 
 
-def test_schema_introspector_load_schema(tmp_path):
+def test_schema_introspector_load_schema(schema_introspector):
     """Test loading Pydantic schema."""
-    schema_file = tmp_path / "schema.py"
-    schema_file.write_text(
-        """
-from pydantic import BaseModel
-
-class AppConfig(BaseModel):
-    app_name: str
-    debug: bool = False
-"""
-    )
-
-    introspector = SchemaIntrospector(schema_file)
+    introspector = schema_introspector("app_debug")
 
     assert introspector.model_class is not None
     assert introspector.model_class.__name__ == "AppConfig"
 
 
-def test_schema_introspector_validate_env_vars(tmp_path):
+def test_schema_introspector_validate_env_vars(schema_introspector):
     """Test validation of environment variables."""
-    schema_file = tmp_path / "schema.py"
-    schema_file.write_text(
-        """
-from pydantic import BaseModel
-
-class AppConfig(BaseModel):
-    app_name: str
-    port: int
-"""
-    )
-
-    introspector = SchemaIntrospector(schema_file)
+    introspector = schema_introspector("app_port")
     env_vars = {
         "app_name": {"value": "myapp", "line": 1},
         "port": {"value": "not_a_number", "line": 2},
@@ -54,20 +35,9 @@ class AppConfig(BaseModel):
     assert any("port" in r["message"].lower() for r in results)
 
 
-def test_schema_introspector_missing_required(tmp_path):
+def test_schema_introspector_missing_required(schema_introspector):
     """Test detection of missing required fields."""
-    schema_file = tmp_path / "schema.py"
-    schema_file.write_text(
-        """
-from pydantic import BaseModel
-
-class AppConfig(BaseModel):
-    app_name: str
-    database_url: str
-"""
-    )
-
-    introspector = SchemaIntrospector(schema_file)
+    introspector = schema_introspector("app_db")
     env_vars = {
         "app_name": {"value": "myapp", "line": 1},
     }
@@ -77,22 +47,14 @@ class AppConfig(BaseModel):
     assert len(results) > 0
     # Should have error for missing database_url
     assert any("database_url" in r["message"].lower() for r in results)
+    # Model-level errors report the plain input values
+    missing = next(r for r in results if r["details"].get("error_type") == "missing")
+    assert missing["details"]["input"] == {"app_name": "myapp"}
 
 
-def test_schema_introspector_get_schema_info(tmp_path):
+def test_schema_introspector_get_schema_info(schema_introspector):
     """Test getting schema info."""
-    schema_file = tmp_path / "schema.py"
-    schema_file.write_text(
-        """
-from pydantic import BaseModel
-
-class AppConfig(BaseModel):
-    app_name: str
-    port: int = 8000
-"""
-    )
-
-    introspector = SchemaIntrospector(schema_file)
+    introspector = schema_introspector("app_port_default")
     info = introspector.get_schema_info()
 
     assert info["model_name"] == "AppConfig"
@@ -114,3 +76,71 @@ def some_function():
 
     with pytest.raises(ValueError, match="No Pydantic BaseModel found"):
         SchemaIntrospector(schema_file)
+
+
+def test_schema_introspector_before_validator_gets_dict(tmp_path):
+    """Test that model validators running before field validation get a dict."""
+    schema_file = tmp_path / "schema.py"
+    schema_file.write_text(
+        """
+from pydantic import BaseModel, model_validator
+
+class AppConfig(BaseModel):
+    app_name: str
+
+    @model_validator(mode="before")
+    @classmethod
+    def lowercase_keys(cls, data):
+        if isinstance(data, dict):
+            data = {key.lower(): value for key, value in data.items()}
+            data.setdefault("app_name", "default")
+        return data
+"""
+    )
+    introspector = SchemaIntrospector(schema_file)
+
+    results = introspector.validate_env_vars({"APP_NAME": {"value": "myapp", "line": 1}})
+
+    assert not [r for r in results if r["rule_id"] == "schema-validation"]
+
+
+def test_schema_introspector_reuses_loaded_model(tmp_path):
+    """Test that an unchanged schema file is only imported once."""
+    schema_file = tmp_path / "schema.py"
+    schema_file.write_text(
+        """
+from pydantic import BaseModel
+
+class AppConfig(BaseModel):
+    app_name: str
+"""
+    )
+
+    first = SchemaIntrospector(schema_file)
+    second = SchemaIntrospector(schema_file)
+
+    assert first.model_class is second.model_class
+
+
+def test_schema_introspector_get_schema_info_cached(schema_introspector):
+    """Test that schema info is built once per model class."""
+    shared = schema_introspector("app_debug")
+
+    first = shared.get_schema_info()
+    second = SchemaIntrospector(shared.schema_path).get_schema_info()
+
+    assert first is second
+    assert first["fields"]["app_name"]["required"] is True
+    assert first["fields"]["debug"]["required"] is False
+
+
+def test_model_snapshot_does_not_pin_model_class():
+    """Test that cached snapshots let unused model classes be collected."""
+    model_class = create_model("Transient", app_name=(str, ...))
+    assert _model_snapshot(model_class) == ((("app_name", True, "<class 'str'>"),), ("app_name",))
+    ref = weakref.ref(model_class)
+
+    del model_class
+    gc.collect()
+
+    assert ref() is None
@@ -0,0 +1,81 @@
+"""
+Smoke tests for the legacy src/ layout modules.
+"""
+
+from pathlib import Path
+
+SCHEMA = """
+from pydantic import BaseModel
+
+class Settings(BaseModel):
+    PORT: int
+    NAME: str
+"""
+
+
+def test_src_parse_env(src_module, tmp_path):
+    """Test parsing into parallel value and line dicts."""
+    schema_introspect = src_module("schema_introspect")
+    env_file = tmp_path / ".env"
+    env_file.write_text("# comment\nPORT = 8080\n\nNAME=app\n")
+
+    parsed = schema_introspect.parse_env(env_file)
+
+    assert parsed.values == {"PORT": "8080", "NAME": "app"}
+    assert parsed.lines == {"PORT": 2, "NAME": 4}
+
+
+def test_src_validate_env(src_module, tmp_path, monkeypatch):
+    """Test validation findings carry lines and callers get fresh section lists."""
+    schema_introspect = src_module("schema_introspect")
+    (tmp_path / "src_layout_schema.py").write_text(SCHEMA)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    env_file = tmp_path / ".env"
+    env_file.write_text("PORT=abc\nNAME=TODO\n")
+
+    findings, policy = schema_introspect.validate_env(env_file, "src_layout_schema:Settings")
+
+    assert [(f["key"], f["line"]) for f in findings["errors"]] == [("PORT", 1)]
+    assert [(f["key"], f["line"]) for f in findings["warnings"]] == [("NAME", 2)]
+    assert policy["errors"]["level"] == "error"
+
+    # Results are cached per file version; mutating one copy must not leak
+    findings["errors"].append({"key": "extra"})
+    again, _ = schema_introspect.validate_env(env_file, "src_layout_schema:Settings")
+    assert [f["key"] for f in again["errors"]] == ["PORT"]
+
+
+def test_src_load_policy(src_module, tmp_path, monkeypatch):
+    """Test the default policy and a cached policy.json."""
+    policy_loader = src_module("policy_loader")
+    monkeypatch.chdir(tmp_path)
+
+    assert policy_loader.load_policy()["secrets"]["level"] == "error"
+
+    Path("policy.json").write_text('{"errors": {"level": "warning"}}')
+    policy = policy_loader.load_policy()
+
+    assert policy == {"errors": {"level": "warning"}}
+    assert policy_loader.load_policy() is policy
+
+
+def test_src_emit_metrics(src_module, tmp_path, monkeypatch):
+    """Test metrics are written only when enabled."""
+    metrics = src_module("metrics")
+    metrics_file = tmp_path / "metrics.prom"
+    monkeypatch.setattr(metrics, "_METRICS_FILE", metrics_file)
+    findings = {"errors": [{}], "warnings": []}
+    policy = {"errors": {"level": "error"}}
+
+    monkeypatch.setattr(metrics, "_ENABLED", False)
+    metrics.emit_metrics(findings, policy, 1.5)
+    assert not metrics_file.exists()
+
+    monkeypatch.setattr(metrics, "_ENABLED", True)
+    metrics.emit_metrics(findings, policy, 1.5)
+    assert metrics_file.read_text().splitlines() == [
+        "env_integrity_scan_duration_ms 1.50",
+        'env_integrity_findings{section="errors",level="error"} 1',
+        'env_integrity_findings{section="warnings",level="note"} 0',
+    ]